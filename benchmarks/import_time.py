@@ -0,0 +1,48 @@
+"""
+Cold import time of flask_request_validator.
+
+    $ python benchmarks/import_time.py
+    $ python benchmarks/import_time.py --repeat 50
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = (
+    'import flask_request_validator',
+    'from flask_request_validator import JsonParam, Pattern, IsEmail',
+    'from flask_request_validator import Param, GET',
+    'from flask_request_validator import validate_params',
+    'import flask',
+)
+
+_TIMER = '''
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(statement: str, repeat: int) -> list:
+    result = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', _TIMER.format(statement=statement)])
+        result.append(float(output) * 1000)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"statement":<70} {"median ms":>10} {"min ms":>10}')
+    for statement in STATEMENTS:
+        timings = measure(statement, args.repeat)
+        print(f'{statement:<70} {statistics.median(timings):>10.2f} {min(timings):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput of one shared schema validated by 1-16 threads.
+Compare the speedup on free-threaded CPython (3.13t, PYTHON_GIL=0) with a GIL build, where threads don't run Python code in parallel.
+
+    $ python benchmarks/threads.py
+    $ python3.13t benchmarks/threads.py --requests 20000 --threads 1 2 4 8 16
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from flask_request_validator import *
+
+PARAMS = (
+    Param('page', GET, int, rules=[Min(1), Max(100)]),
+    Param('X-Tenant', HEADER, str, rules=[Pattern(r'^[a-z]+$'), MaxLength(8)]),
+    JsonParam({
+        'email': [IsEmail()],
+        'kind': [Enum('a', 'b')],
+        'tags': JsonParam([Pattern(r'^\w+$'), MaxLength(8)], as_list=True),
+        'items': JsonParam({'id': [IntRule(), Min(1)], 'name': [MinLength(1)]}, as_list=True),
+    }),
+)
+
+
+def _request(ix: int) -> RequestData:
+    return RequestData(
+        args={'page': str(ix % 100 + 1)},
+        headers={'X-Tenant': 'tenant'},
+        json={
+            'email': f'user{ix}@example.com',
+            'kind': 'ab'[ix % 2],
+            'tags': ['red', 'green', 'blue'],
+            'items': [{'id': i + 1, 'name': f'item{i}'} for i in range(10)],
+        },
+    )
+
+
+def measure(plan: Any, threads: int, requests: int) -> float:
+    """
+    :return: validated requests per second
+    """
+    sources = [_request(ix) for ix in range(requests)]
+    chunks = [sources[ix::threads] for ix in range(threads)]
+
+    def run(chunk: list) -> None:
+        for source in chunk:
+            validate_request(plan, source)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(run, chunks))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}')
+    plan = validation_plan(PARAMS)
+    measure(plan, 1, 100)  # warm up caches
+
+    base = None
+    print(f'{"threads":>8} {"requests/s":>12} {"speedup":>8}')
+    for threads in args.threads:
+        throughput = measure(plan, threads, args.requests)
+        base = base or throughput
+        print(f'{threads:>8} {throughput:>12.0f} {throughput / base:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,108 @@
-from .validator import (
-    validate_params,
-    Param,
-    GET,
-    FORM,
-    JSON,
-    PATH,
-    HEADER,
-)
-from .nested_json import JsonParam
-from .valid_request import ValidRequest
-from .after_param import AbstractAfterParam
-from .rules import *
-from .files import File, FileChain
+"""
+Public names are loaded on first access (PEP 562), so importing the package
+to share schemas doesn't import flask until validation is used.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    'validator': (
+        'validate_params',
+        'validate_request',
+        'validation_plan',
+        'Param',
+        'GET',
+        'FORM',
+        'JSON',
+        'PATH',
+        'HEADER',
+    ),
+    'request_data': ('RequestData', ),
+    'dt_utils': ('dt_from_iso', ),
+    'nested_json': ('JsonParam', 'DiscriminatedJsonParam'),
+    'ndjson': ('NdJsonParam', ),
+    'limits': ('RequestLimits', ),
+    'valid_request': ('ValidRequest', ),
+    'after_param': ('AbstractAfterParam', ),
+    'files': ('File', 'FileChain'),
+    'tables': ('InTable', ),
+    'rules': (
+        'REGEX_EMAIL',
+        'AbstractRule',
+        'CompositeRule',
+        'Pattern',
+        'Enum',
+        'MaxLength',
+        'MinLength',
+        'NotEmpty',
+        'Max',
+        'Min',
+        'IsDatetimeIsoFormat',
+        'IsEmail',
+        'Datetime',
+        'Number',
+        'IntRule',
+        'FloatRule',
+        'BoolRule',
+    ),
+    'exceptions': (
+        'RequestError',
+        'AfterParamError',
+        'WrongUsageError',
+        'JsonError',
+        'InvalidJsonError',
+        'JsonListExpectedError',
+        'JsonDictExpectedError',
+        'JsonListItemTypeError',
+        'RequiredValueError',
+        'RequiredJsonKeyError',
+        'TypeConversionError',
+        'RuleError',
+        'ValuePatternError',
+        'ValueEnumError',
+        'ValueMaxLengthError',
+        'ValueMinLengthError',
+        'ValueMaxError',
+        'ValueMinError',
+        'ValueEmptyError',
+        'ValueDtIsoFormatError',
+        'ValueEmailError',
+        'NumberError',
+        'ValueDatetimeError',
+        'ListRuleError',
+        'MissingJsonKeyError',
+        'UnknownJsonKeyError',
+        'ValueTableError',
+        'RulesError',
+        'InvalidHeadersError',
+        'FileError',
+        'FilesLimitError',
+        'FileSizeError',
+        'FileNameError',
+        'FileMimeTypeError',
+        'FileMissingError',
+        'RequestLimitError',
+        'InvalidRequestError',
+    ),
+}
+_MODULE_BY_NAME = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_BY_NAME)
+
+
+def __getattr__(name: str):
+    module = _MODULE_BY_NAME.get(name)
+    if module is None:
+        try:  # submodule, e.g. flask_request_validator.rules without the import statement
+            return import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,60 @@
+"""
+Structured request bodies by Content-Type. JSON params and JsonParam read the decoded body,
+so the same schemas validate JSON, MessagePack and CBOR requests:
+
+    application/json                            flask.request.get_json()
+    application/msgpack, application/x-msgpack  pip install msgpack
+    application/cbor                            pip install cbor2
+
+Bodies of other types are read by get_json(). When a decoder library is not installed
+the body is read by get_json() too, so flask responds 415 Unsupported Media Type.
+"""
+from typing import Any, Callable, Dict
+
+from .exceptions import InvalidJsonError
+
+_BODY_ATTRIBUTE = '_frv_body'
+_MISSING = object()
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    import msgpack
+    return msgpack.unpackb(data, raw=False)
+
+
+def _cbor_loads(data: bytes) -> Any:
+    import cbor2
+    return cbor2.loads(data)
+
+
+# mimetype -> decoder of raw body. Decoders raise ImportError when a library is not installed
+BODY_DECODERS = {
+    'application/msgpack': _msgpack_loads,
+    'application/x-msgpack': _msgpack_loads,
+    'application/cbor': _cbor_loads,
+}  # type: Dict[str, Callable[[bytes], Any]]
+
+
+def load_body(source: Any) -> Any:
+    """
+    Decoded body of flask.request or RequestData. Decoded once per request.
+
+    :raises InvalidJsonError: body can't be decoded
+    """
+    decoder = BODY_DECODERS.get(getattr(source, 'mimetype', None))
+    if decoder is None:
+        return source.get_json()
+
+    body = getattr(source, _BODY_ATTRIBUTE, _MISSING)
+    if body is not _MISSING:
+        return body
+
+    try:
+        body = decoder(source.get_data())
+    except ImportError:
+        return source.get_json()
+    except Exception as e:
+        raise InvalidJsonError(f'invalid {source.mimetype} body, {e}')
+
+    setattr(source, _BODY_ATTRIBUTE, body)
+    return body
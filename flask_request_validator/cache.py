@@ -0,0 +1,178 @@
+"""
+Results of validate_params cached by a digest of request sources which are read by the schema:
+declared headers, PATH values, query string, Content-Type and body.
+
+    @validate_params(Param('page', GET, int), USER, cache=LRUCache(max_size=10000, ttl=60))
+
+Valid requests are stored as ValidRequest (views get copies), invalid requests as errors
+without tracebacks (each hit raises a new copy).
+Results must depend only on the request, so rules should be pure functions of values
+and schemas with after params, callable defaults, files or ndjson are refused with WrongUsageError.
+Bodies of cached endpoints are read before validation to build the key.
+
+A backend is any object with get(key) -> value or None and set(key, value),
+e.g. a store shared by worker processes which pickles values. Results of typed=True are pickled
+with their schemas (classes are generated again on unpickling), so rules of such schemas should be picklable.
+"""
+import hashlib
+import types
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+
+from .exceptions import RequestError, WrongUsageError
+from .files import File, FileChain
+from .ndjson import NdJsonParam
+from .validator import GET, PATH, Param, _ValidationPlan, _ValidRequest, _validate
+
+_NONE = b'\x00'
+
+
+class LRUCache:
+    """
+    In-process backend. Least recently used results are evicted over max_size, results older than ttl expire
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = None) -> None:
+        """
+        :param ttl: seconds, None - results don't expire
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()  # key -> (expiration time or None, value)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: bytes) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+
+            expires, value = item
+            if expires is not None and expires <= monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: bytes, value: Any) -> None:
+        expires = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            self._items[key] = expires, value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+def _check_pure(plan: _ValidationPlan) -> None:
+    """
+    :raises WrongUsageError: result of the schema doesn't depend only on the request
+    """
+    reason = None
+    if plan.after_params:
+        reason = 'after params'
+    for param in plan.header_params + plan.url_params + plan.body_params:
+        if isinstance(param, (File, FileChain)):
+            reason = 'files'
+        elif isinstance(param, NdJsonParam):
+            reason = 'ndjson'
+        elif isinstance(param, Param) and isinstance(param.default, types.LambdaType):
+            reason = f'callable default of Param.name = "{param.name}"'
+    if reason is not None:
+        raise WrongUsageError(f'results of schemas with {reason} are not cached')
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    Copy without traceback, context and cause. Errors have no common constructor, so attributes are copied.
+    Nested errors are copied too: their tracebacks keep frames of the request which failed first (environ, streams)
+    """
+    copied = type(error).__new__(type(error))
+    copied.__dict__.update({name: _copy_nested(value) for name, value in error.__dict__.items()})
+    copied.args = _copy_nested(error.args)
+    return copied
+
+
+def _copy_nested(value: Any) -> Any:
+    if isinstance(value, BaseException):
+        return _copy_error(value)
+    if isinstance(value, dict):
+        return type(value)((key, _copy_nested(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copy_nested(item) for item in value)
+    return value
+
+
+def _update(digest: Any, value: Optional[bytes]) -> None:
+    if value is None:
+        digest.update(_NONE)
+        return
+    digest.update(len(value).to_bytes(8, 'big'))
+    digest.update(value)
+
+
+class CachedPlan:
+    """
+    Validation plan of an endpoint with cached results
+    """
+    def __init__(self, plan: _ValidationPlan, backend: Any, endpoint: str) -> None:
+        """
+        :param endpoint: prefix of keys, so endpoints share a backend
+        :raises WrongUsageError:
+        """
+        _check_pure(plan)
+        self.plan = plan
+        self.backend = backend
+        self._endpoint = endpoint.encode()
+        self._header_names = tuple(param.name for param in plan.header_params)
+        self._path_names = tuple(param.name for param in plan.url_params if param.param_type == PATH)
+        self._reads_query = any(param.param_type == GET for param in plan.url_params)
+        self._reads_body = bool(plan.body_params)
+        # copies of results share generated classes
+        self._memo = {} if plan.typed is None else {id(plan.typed): plan.typed}
+
+    def key(self, source: Any) -> bytes:
+        digest = hashlib.blake2b(self._endpoint, digest_size=16)
+        for name in self._header_names:
+            value = source.headers.get(name)
+            _update(digest, None if value is None else value.encode())
+        view_args = source.view_args or {}
+        for name in self._path_names:
+            _update(digest, repr(view_args.get(name)).encode())
+        if self._reads_query:
+            _update(digest, source.query_string)
+        if self._reads_body:
+            content_type = source.headers.get('Content-Type')
+            _update(digest, None if content_type is None else content_type.encode())
+            _update(digest, source.get_data(cache=True, parse_form_data=False))
+        return digest.digest()
+
+    def validate(self, source: Any) -> _ValidRequest:
+        """
+        :raises: errors of validate_params
+        """
+        if self.plan.limits is not None:
+            self.plan.limits.check_size(source)  # before the body is read for the key
+
+        key = self.key(source)
+        result = self.backend.get(key)
+        if isinstance(result, RequestError):
+            raise _copy_error(result)
+        if result is not None:
+            return deepcopy(result, dict(self._memo))
+
+        try:
+            valid = _validate(self.plan, source)
+        except WrongUsageError:
+            raise
+        except RequestError as e:
+            self.backend.set(key, _copy_error(e))
+            raise
+
+        valid._source = None
+        self.backend.set(key, deepcopy(valid, dict(self._memo)))
+        return valid
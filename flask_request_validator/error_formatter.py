@@ -1,12 +1,20 @@
+import warnings
+from itertools import islice
+from typing import Iterator
+
 from .validator import JSON, FORM, PATH, GET
 from .exceptions import *
+from .json_pointer import escape_token
+
+DEFAULT_MAX_ERRORS = 100
 
 
 def demo_error_formatter(error: Union[InvalidRequestError, InvalidHeadersError, AfterParamError]) -> list:
     """
     Just demo. !!! not supported !!!
-    @deprecated v5.0
+    @deprecated v5.0. Output is kept as is for existing handlers, use error_formatter
     """
+    warnings.warn('demo_error_formatter is deprecated, use error_formatter', DeprecationWarning, stacklevel=2)
     if isinstance(error, (InvalidHeadersError, AfterParamError)):
         return [str(error)]
 
@@ -46,3 +54,94 @@ def demo_error_formatter(error: Union[InvalidRequestError, InvalidHeadersError,
         result.append(item)
 
     return result
+
+
+def _entries(path: str, error: RequestError) -> Iterator[Dict[str, str]]:
+    if isinstance(error, RulesError):
+        for rule_error in error.errors:
+            yield {'path': path, 'code': type(rule_error).__name__, 'message': str(rule_error)}
+        return
+    yield {'path': path, 'code': type(error).__name__, 'message': str(error)}
+
+
+def _keyed_entries(prefix: str, errors: Dict[str, RequestError]) -> Iterator[Dict[str, str]]:
+    for key, error in errors.items():
+        if isinstance(error, list):  # NDJSON line errors
+            yield from iter_json_errors(error, prefix + '/' + escape_token(key))
+        else:
+            yield from _entries(prefix + '/' + escape_token(key), error)
+
+
+def iter_json_errors(errors: List[Union[JsonError, InvalidJsonError]], prefix: str = '') -> Iterator[Dict[str, str]]:
+    """
+    Flat {path, code, message} entries of JsonParam errors. Paths are JSON pointers, see: JsonError.pointer.
+    Errors without a pointer (not raised by JsonParam) are located by depth, which has no list item indexes
+    """
+    for json_error in errors:
+        if not isinstance(json_error, JsonError):
+            yield from _entries(prefix, json_error)
+            continue
+
+        pointer = json_error.pointer
+        if pointer is None:
+            # depth[0] is always 'root'
+            pointer = ''.join('/' + escape_token(token) for token in json_error.depth[1:])
+        pointer = prefix + pointer
+
+        if isinstance(json_error, JsonListExpectedError):
+            yield from _entries(pointer, json_error)
+            continue
+
+        for key, node_errors in json_error.errors.items():
+            node_pointer = pointer + '/' + escape_token(key)
+            if isinstance(node_errors, dict):
+                yield from _keyed_entries(node_pointer, node_errors)
+            else:
+                yield from _entries(node_pointer, node_errors)
+
+
+def iter_errors(error: RequestError) -> Iterator[Dict[str, str]]:
+    """
+    Lazily yields flat {path, code, message} entries.
+    Path is a JSON pointer prefixed by the request part: /header/Authorization, /json/users/0/email
+    """
+    if isinstance(error, InvalidHeadersError):
+        yield from _keyed_entries('/header', error.errors)
+        return
+
+    if not isinstance(error, InvalidRequestError):
+        yield from _entries('', error)
+        return
+
+    yield from _keyed_entries('/path', error.path)
+    yield from _keyed_entries('/get', error.get)
+    yield from _keyed_entries('/form', error.form)
+    if isinstance(error.json, dict):
+        yield from _keyed_entries('/json', error.json)
+    else:
+        yield from iter_json_errors(error.json, '/json')
+
+    for file_error in error.files:
+        file_name = getattr(file_error, 'file_name', None)
+        yield from _entries('/files' if file_name is None else '/files/' + escape_token(file_name), file_error)
+
+
+def error_formatter(error: RequestError, max_errors: int = DEFAULT_MAX_ERRORS) -> List[Dict[str, str]]:
+    """
+    Compact list of {path, code, message} entries. Values are str only, so the result
+    can be serialized by json / orjson as is.
+
+    >>> error_formatter(InvalidHeadersError({'Authorization': RulesError(ValueEnumError(('Bearer token',)))}))
+    [{'path': '/header/Authorization', 'code': 'ValueEnumError', 'message': 'not allowed, allowed values: Bearer token'}]
+
+    :param max_errors: entries limit. Formatting stops after the limit and
+                       a TooManyErrors entry is appended
+    """
+    result = list(islice(iter_errors(error), max_errors + 1))
+    if len(result) > max_errors:
+        result[max_errors] = {
+            'path': '',
+            'code': 'TooManyErrors',
+            'message': f'errors limit {max_errors} exceeded',
+        }
+    return result
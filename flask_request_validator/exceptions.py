@@ -16,12 +16,25 @@ class WrongUsageError(RequestError):
 
 
 class JsonError(RequestError):
+    pointer = None  # JSON pointer of the node with list item indexes, depth has no indexes. set by JsonParam
+
     def __init__(self, depth: List[str], errors: Dict[int, RequestError], as_list: bool):
         self.depth = depth
         self.errors = errors
         self.as_list = as_list
 
 
+class InvalidJsonError(RequestError):
+    """
+    Raises when json document can't be decoded
+    """
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self) -> str:
+        return f'invalid json: {self.message}'
+
+
 class JsonListExpectedError(JsonError):
     def __init__(self, depth: List[str]):
         self.depth = depth
@@ -87,7 +100,7 @@ class ValueEnumError(RuleError):
         self.allowed = allowed
 
     def __str__(self) -> str:
-        return 'not allowed, allowed values: ' + '|'.join(self.allowed)
+        return 'not allowed, allowed values: ' + '|'.join(map(str, self.allowed))
 
 
 class ValueMaxLengthError(RuleError):
@@ -165,6 +178,23 @@ class MissingJsonKeyError(RuleError):
         return 'key is required'
 
 
+class UnknownJsonKeyError(RuleError):
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def __str__(self) -> str:
+        return 'key is not allowed'
+
+
+class ValueTableError(RuleError):
+    def __init__(self, path: str, deny: bool) -> None:
+        self.path = path
+        self.deny = deny
+
+    def __str__(self) -> str:
+        return 'value is denied' if self.deny else 'value is not allowed'
+
+
 class RulesError(RequestError):
     def __init__(self, *args: RuleError):
         self.errors = args
@@ -188,11 +218,17 @@ class FileError(RequestError):
     def __init__(self, file_name: str) -> None:
         self.file_name = file_name
 
+    def __str__(self) -> str:
+        return f'invalid file {self.file_name}'
+
 
 class FilesLimitError(FileError):
     def __init__(self, files_limit: int) -> None:
         self.files_limit = files_limit
 
+    def __str__(self) -> str:
+        return f'too many files, max files = {self.files_limit}'
+
 
 class FileSizeError(FileError):
     def __init__(self, file_name: str, file_size: int, size_limit: int) -> None:
@@ -200,12 +236,18 @@ class FileSizeError(FileError):
         self.size_limit = size_limit
         super().__init__(file_name)
 
+    def __str__(self) -> str:
+        return f'file is too large, max size = {self.size_limit}'
+
 
 class FileNameError(FileError):
     def __init__(self, file_names: list, names_pattern: str) -> None:
         self.names_pattern = names_pattern
         self.file_names = file_names
 
+    def __str__(self) -> str:
+        return f'file names {", ".join(self.file_names)} do not match pattern {self.names_pattern}'
+
 
 class FileMimeTypeError(FileError):
     def __init__(self, file_name: str, mime_type: str, available_mime_types: Iterable) -> None:
@@ -213,9 +255,22 @@ class FileMimeTypeError(FileError):
         self.available_mime_types = available_mime_types
         super().__init__(file_name)
 
+    def __str__(self) -> str:
+        return f'mime type {self.mime_type} not allowed, allowed: {"|".join(self.available_mime_types)}'
+
 
 class FileMissingError(FileError):
-    pass
+    def __str__(self) -> str:
+        return 'file is required'
+
+
+class RequestLimitError(RequestError):
+    def __init__(self, limit: str, max_value: int) -> None:
+        self.limit = limit
+        self.max_value = max_value
+
+    def __str__(self) -> str:
+        return f'request exceeds {self.limit} = {self.max_value}'
 
 
 class InvalidRequestError(RequestError):
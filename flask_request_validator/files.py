@@ -1,58 +1,173 @@
-import mimetypes
 import re
-from typing import Iterable, Dict
+from typing import Any, Iterable, Dict, List, Optional, Union, TYPE_CHECKING
 
-from werkzeug.datastructures import FileStorage
+from .exceptions import FileError, FilesLimitError, FileMimeTypeError, FileSizeError, FileNameError, FileMissingError
+from .rules import _Frozen
 
-from .exceptions import FilesLimitError, FileMimeTypeError, FileSizeError, FileNameError, FileMissingError
+if TYPE_CHECKING:
+    from werkzeug.datastructures import FileStorage
 
 
-class File:
+def _strip_known_extension(file_name: str) -> str:
+    """
+    report.pdf -> report, archive.unknown -> archive.unknown
+    """
+    import mimetypes  # the types table is loaded only when file names are checked
+
+    ext = file_name[file_name.rfind('.'):] if '.' in file_name else ''
+    if ext and ext in mimetypes.types_map:
+        return file_name[0:-len(ext)]
+    return file_name
+
+
+def _file_size(file: 'FileStorage') -> int:
+    size = getattr(file.stream, 'received', None)
+    return len(file.read()) if size is None else size
+
+
+class _LimitedStream:
+    """
+    Upload container which counts received bytes. Parsing is aborted as soon as a file exceeds max_size.
+    max_size None - the file is invalid anyway, content is dropped
+    """
+    def __init__(self, stream: Any, max_size: Optional[int], file_name: str) -> None:
+        self._stream = stream
+        self._max_size = max_size
+        self._file_name = file_name
+        self.received = 0
+
+    def write(self, data: bytes) -> int:
+        """
+        :raises FileSizeError:
+        """
+        self.received += len(data)
+        if self._max_size is None:
+            return len(data)
+        if self.received > self._max_size:
+            raise FileSizeError(self._file_name, self.received, self._max_size)
+        return self._stream.write(data)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class FileStreamLimits:
+    """
+    Limits of FileChain params applied by werkzeug while multipart body is parsed.
+    FileChain checks every file, so parsing (and reading of the body) is aborted at the first file
+    of a wrong mime type (FileMimeTypeError) or over max_size (FileSizeError, size received so far).
+    Errors of aborted parsing name the file by its file name: werkzeug doesn't pass field names to the stream factory.
+    Content of files with wrong names is not stored, FileNameError of all such files is raised by FileChain validation.
+    max_files is checked only by FileChain: it counts fields, not file parts.
+    Files of File params are stored as is: without field names parts can't be matched to File params
+    """
+    def __init__(self, params: List[Union['File', 'FileChain']]) -> None:
+        self._chains = [p for p in params if isinstance(p, FileChain)]
+        self._enabled = bool(self._chains)
+        self._max_size = min((c._max_size for c in self._chains), default=None)
+
+    def parse(self, request: Any) -> None:
+        """
+        Parses form and files of werkzeug request. Other sources are ignored
+
+        :raises FileMimeTypeError:
+        :raises FileSizeError:
+        """
+        request = getattr(request, '_get_current_object', lambda: request)()
+        if not self._enabled or not hasattr(request, '_get_file_stream') or 'form' in request.__dict__:
+            return
+
+        default_factory = request._get_file_stream
+
+        def stream_factory(total_content_length, content_type, filename=None, content_length=None):
+            stream = default_factory(total_content_length, content_type, filename, content_length)
+            if not filename:
+                return stream
+            return _LimitedStream(stream, self._stored_size(content_type, filename), filename)
+
+        request._get_file_stream = stream_factory
+        try:
+            request.files
+        except FileError:
+            empty = request.parameter_storage_class()
+            request.__dict__['form'], request.__dict__['files'] = empty, empty
+            raise
+        finally:
+            del request._get_file_stream
+
+    def _stored_size(self, content_type: str, filename: str) -> Optional[int]:
+        """
+        :raises FileMimeTypeError:
+        """
+        name = _strip_known_extension(filename)
+        for chain in self._chains:
+            if chain._name_pattern and not chain._get_pattern().match(name):
+                return None  # FileChain reports names of all such files
+        mime_type = (content_type or '').split(';')[0].strip().lower()
+        for chain in self._chains:
+            if mime_type not in chain._mime_types:
+                raise FileMimeTypeError(filename, mime_type, chain._mime_types)
+        return self._max_size
+
+
+class File(_Frozen):
     def __init__(self, name: str, mime_types: Iterable, max_size: int) -> None:
-        self._mime_types = mime_types
+        self._mime_types = tuple(mime_types)
         self._max_size = max_size
         self._name = name
+        self._freeze()
 
-    def validate(self, files: Dict[str, FileStorage]):
+    def validate(self, files: Dict[str, 'FileStorage']):
         file = files.get(self._name)
 
         if not file:
             raise FileMissingError(self._name)
+        self._validate_file(file)
+
+    def _validate_file(self, file: 'FileStorage') -> None:
         if file.mimetype not in self._mime_types:
             raise FileMimeTypeError(file.name, file.mimetype, self._mime_types)
 
-        file_length = len(file.read())
+        file_length = _file_size(file)
         if file_length > self._max_size:
             raise FileSizeError(file.name, file_length, self._max_size)
 
 
-class FileChain:
+class FileChain(_Frozen):
     def __init__(self, mime_types: Iterable, max_size: int, max_files: int, name_pattern: str = '') -> None:
         self._name_pattern = name_pattern
         self._max_files = max_files
-        self._mime_types = mime_types
+        self._mime_types = tuple(mime_types)
         self._max_size = max_size
+        self._compiled_pattern = None
+        self._freeze()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_compiled_pattern'] = None
+        return state
+
+    def _get_pattern(self) -> 're.Pattern':
+        if self._compiled_pattern is None:
+            self._compiled_pattern = re.compile(self._name_pattern)
+        return self._compiled_pattern
 
-    def validate(self, files: Dict[str, FileStorage]) -> None:
+    def validate(self, files: Dict[str, 'FileStorage']) -> None:
         if len(files) > self._max_files:
             raise FilesLimitError(self._max_files)
 
         bad_names = []
-        mime_types = mimetypes.types_map
-        for name, file in files.items():
+        items = files.items(multi=True) if hasattr(files, 'getlist') else files.items()  # every file of a field
+        for name, file in items:
             if self._name_pattern:
-                pattern = re.compile(self._name_pattern)
-                file_name = file.filename
-                for ext in mime_types.keys():
-                    if file_name.endswith(ext):
-                        file_name = file_name[0:file_name.rfind(ext)]
-                        break
-
-                if not pattern.match(file_name):
+                if not self._get_pattern().match(_strip_known_extension(file.filename)):
                     bad_names.append(file.filename)
                     continue
 
-            File(name, self._mime_types, self._max_size).validate(files)
+            File(name, self._mime_types, self._max_size)._validate_file(file)
 
         if bad_names:
             raise FileNameError(bad_names, self._name_pattern)
@@ -0,0 +1,8 @@
+from typing import Any
+
+
+def escape_token(token: Any) -> str:
+    """
+    RFC 6901 reference token: ~ -> ~0, / -> ~1
+    """
+    return str(token).replace('~', '~0').replace('/', '~1')
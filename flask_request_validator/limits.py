@@ -0,0 +1,215 @@
+"""
+Request size and structure limits. Checked after headers and url params, before the body is validated:
+
+    @validate_params(
+        Param('page', GET, int),
+        USER,
+        RequestLimits.from_schema(USER, max_body_size=64 * 1024, max_list_length=100),
+    )
+
+max_body_size is compared with Content-Length, so oversized bodies are rejected without reading them.
+Bodies without Content-Length (chunked) are limited while reading: the input stream of the request
+raises RequestLimitError after max_body_size bytes.
+Decoded json bodies are walked once before rules run: the walk stops on the first exceeded limit.
+"""
+from typing import Any, Optional
+
+from .exceptions import RequestLimitError
+from .nested_json import DiscriminatedJsonParam, JsonParam
+from .rules import (
+    BoolRule,
+    CompositeRule,
+    Datetime,
+    FloatRule,
+    IntRule,
+    IsDatetimeIsoFormat,
+    IsEmail,
+    Number,
+    _Frozen,
+)
+
+_CHUNK_SIZE = 64 * 1024
+# rules which never accept lists or objects. Pattern matches str(value) and Enum may contain lists, so they are not here
+_SCALAR_RULES = (Number, IntRule, FloatRule, BoolRule, IsEmail, Datetime, IsDatetimeIsoFormat)
+
+
+class RequestLimits(_Frozen):
+    """
+    None - no limit. depth of {'a': [1]} is 2, nodes - count of containers and scalars
+    """
+    def __init__(
+        self,
+        max_body_size: int = None,
+        max_depth: int = None,
+        max_nodes: int = None,
+        max_list_length: int = None,
+    ) -> None:
+        self.max_body_size = max_body_size
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_list_length = max_list_length
+        self._freeze()
+
+    @classmethod
+    def from_schema(
+        cls,
+        schema: JsonParam,
+        max_body_size: int = None,
+        max_list_length: int = None,
+    ) -> 'RequestLimits':
+        """
+        Depth and nodes of the largest valid json. They are derived only when all values of the schema
+        are scalars (checked by IntRule, IsEmail, Datetime, etc.) and all objects have extra='forbid',
+        nodes only when max_list_length is set.
+        """
+        return cls(
+            max_body_size=max_body_size,
+            max_depth=_schema_depth(schema),
+            max_nodes=_schema_nodes(schema, max_list_length),
+            max_list_length=max_list_length,
+        )
+
+    def check_size(self, source: Any) -> None:
+        """
+        :raises RequestLimitError:
+        """
+        if self.max_body_size is None:
+            return
+
+        content_length = getattr(source, 'content_length', None)
+        if content_length is not None:
+            if content_length > self.max_body_size:
+                raise RequestLimitError('max_body_size', self.max_body_size)
+            return
+
+        stream = getattr(source, 'stream', None)
+        if stream is not None and not isinstance(stream, _LimitedStream):
+            source.stream = _LimitedStream(stream, self.max_body_size)
+
+    def check_json(self, value: Any) -> None:
+        """
+        :raises RequestLimitError:
+        """
+        if self.max_depth is None and self.max_nodes is None and self.max_list_length is None:
+            return
+
+        nodes = 0
+        stack = [(value, 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes += 1
+            if self.max_nodes is not None and nodes > self.max_nodes:
+                raise RequestLimitError('max_nodes', self.max_nodes)
+
+            if isinstance(node, dict):
+                children = node.values()
+            elif isinstance(node, list):
+                if self.max_list_length is not None and len(node) > self.max_list_length:
+                    raise RequestLimitError('max_list_length', self.max_list_length)
+                children = node
+            else:
+                continue
+
+            depth += 1
+            if self.max_depth is not None and depth > self.max_depth:
+                raise RequestLimitError('max_depth', self.max_depth)
+            stack.extend((child, depth) for child in children)
+
+
+class _LimitedStream:
+    """
+    Input stream which raises RequestLimitError when more than max_size bytes are read
+    """
+    def __init__(self, stream: Any, max_size: int) -> None:
+        self._stream = stream
+        self._max_size = max_size
+        self._size = 0
+
+    def _count(self, data: bytes) -> bytes:
+        self._size += len(data)
+        if self._size > self._max_size:
+            raise RequestLimitError('max_body_size', self._max_size)
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        if size is not None and size >= 0:
+            return self._count(self._stream.read(size))
+
+        chunks = []
+        chunk = self.read(_CHUNK_SIZE)
+        while chunk:
+            chunks.append(chunk)
+            chunk = self.read(_CHUNK_SIZE)
+        return b''.join(chunks)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._count(self._stream.readline(size))
+
+    def __iter__(self):
+        line = self.readline()
+        while line:
+            yield line
+            line = self.readline()
+
+
+def _is_scalar(rules: CompositeRule) -> bool:
+    return any(isinstance(rule, _SCALAR_RULES) for rule in rules)
+
+
+def _object_schemas(schema: JsonParam) -> Optional[list]:
+    """
+    :return: None if an object accepts unknown keys
+    """
+    variants = list(schema.schemas.values()) if isinstance(schema, DiscriminatedJsonParam) else [schema]
+    if any(variant.extra != 'forbid' for variant in variants):
+        return None
+    return variants
+
+
+def _schema_depth(schema: JsonParam) -> Optional[int]:
+    rules_map = schema.rules_map
+    if isinstance(rules_map, CompositeRule):
+        return (1 if schema.as_list else 0) if _is_scalar(rules_map) else None
+
+    variants = _object_schemas(schema)
+    if variants is None:
+        return None
+
+    depth = 0
+    for variant in variants:
+        for rules in variant.rules_map.values():
+            child = _schema_depth(rules) if isinstance(rules, JsonParam) else (0 if _is_scalar(rules) else None)
+            if child is None:
+                return None
+            depth = max(depth, child)
+    return depth + (2 if schema.as_list else 1)
+
+
+def _schema_nodes(schema: JsonParam, max_list_length: Optional[int]) -> Optional[int]:
+    rules_map = schema.rules_map
+    if isinstance(rules_map, CompositeRule):
+        if not _is_scalar(rules_map):
+            return None
+        nodes = 1
+    else:
+        variants = _object_schemas(schema)
+        if variants is None:
+            return None
+
+        nodes = 0
+        for variant in variants:
+            variant_nodes = 1
+            for rules in variant.rules_map.values():
+                child = _schema_nodes(rules, max_list_length) if isinstance(rules, JsonParam) else (
+                    1 if _is_scalar(rules) else None
+                )
+                if child is None:
+                    return None
+                variant_nodes += child
+            nodes = max(nodes, variant_nodes)
+
+    if not schema.as_list:
+        return nodes
+    if max_list_length is None:
+        return None
+    return 1 + max_list_length * nodes
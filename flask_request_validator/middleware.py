@@ -0,0 +1,212 @@
+"""
+Validation before flask dispatch. Invalid requests are rejected by the middleware
+from the WSGI environ: flask doesn't push a request context, run before_request hooks or views.
+
+    app.wsgi_app = ValidationMiddleware.from_app(app)  # schemas of decorated views
+
+    middleware = ValidationMiddleware(app.wsgi_app)  # or central registry of schemas
+    middleware.add('/users/<int:user_id>', [Param('user_id', PATH, int), USER], methods=['PUT'])
+    app.wsgi_app = middleware
+
+Views decorated by validate_params get the ValidRequest built by the middleware without second validation.
+After params and callable defaults need the app and request contexts, so they are run by the view.
+"""
+import json
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+from werkzeug.wrappers import Request, Response
+
+from .exceptions import RequestError, RequestLimitError, WrongUsageError
+from .validator import VALID_ENVIRON_KEY, _PLAN_ATTRIBUTE, _ValidationPlan, _validate
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class _TeeStream:
+    """
+    Input stream which writes read chunks to a spool
+    """
+    def __init__(self, stream: Any, spool: Any) -> None:
+        self._stream = stream
+        self._spool = spool
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._spool.write(chunk)
+        return chunk
+
+    def readline(self, size: int = -1) -> bytes:
+        chunk = self._stream.readline(size)
+        self._spool.write(chunk)
+        return chunk
+
+
+class _BufferedRequest(Request):
+    """
+    Body is read once, so the application parses it again after validation.
+    JSON and urlencoded bodies are kept in memory, multipart bodies are streamed to the parser
+    and spooled to a temporary file over spool_size
+    """
+    view_args = None  # type: Dict[str, Any]
+    spool_size = 512 * 1024
+    _spool = None
+
+    def _get_stream_for_parsing(self) -> Any:
+        if self.mimetype != 'multipart/form-data':
+            self.get_data(cache=True, parse_form_data=False)
+            return super()._get_stream_for_parsing()
+
+        self._spool = SpooledTemporaryFile(max_size=self.spool_size)
+        return _TeeStream(super()._get_stream_for_parsing(), self._spool)
+
+
+def _default_error_handler(error: RequestError) -> Response:
+    """
+    413 for RequestLimits (as for MAX_CONTENT_LENGTH of flask), 400 for other errors
+    """
+    from .error_formatter import error_formatter
+
+    status = 413 if isinstance(error, RequestLimitError) else 400
+    return Response(json.dumps({'errors': error_formatter(error)}), status, mimetype='application/json')
+
+
+class ValidationMiddleware:
+    def __init__(
+        self,
+        app: Callable,
+        error_handler: Callable[[RequestError], Callable] = None,
+        max_content_length: int = None,
+    ) -> None:
+        """
+        :param app: WSGI application
+        :param error_handler: WSGI response of an error. error_formatter entries by default:
+                              413 for RequestLimitError, 400 for other errors
+        :param max_content_length: bytes, larger bodies are rejected with 413 while reading. None - no limit
+        """
+        self.app = app
+        self.error_handler = error_handler or _default_error_handler
+        self.max_content_length = max_content_length
+        self._map = Map()
+        self._plans = []  # type: List[Dict[str, _ValidationPlan]]
+        self._url_adapter = None  # type: Optional[Callable[[Request], Any]]  # routing of from_app
+        self._endpoints = dict()  # type: Dict[str, int]  # endpoint of the app -> index of plans
+
+    @classmethod
+    def from_app(
+        cls,
+        app: Any,
+        error_handler: Callable[[RequestError], Callable] = None,
+        max_content_length: int = None,
+    ) -> 'ValidationMiddleware':
+        """
+        Registers schemas of views and flask-restful / MethodView methods decorated by validate_params.
+        Requests are routed by the url map of the app, so subdomains, hosts and SERVER_NAME match as in flask
+
+        :param max_content_length: MAX_CONTENT_LENGTH of the app config by default
+        """
+        if max_content_length is None:
+            max_content_length = app.config.get('MAX_CONTENT_LENGTH')
+        middleware = cls(app.wsgi_app, error_handler, max_content_length)
+        middleware._map.converters.update(app.url_map.converters)
+        middleware._url_adapter = app.create_url_adapter
+        for rule in app.url_map.iter_rules():
+            view = app.view_functions.get(rule.endpoint)
+            view_class = getattr(view, 'view_class', None)
+            plans = dict()
+            for method in rule.methods or ():
+                if method == 'OPTIONS' and getattr(rule, 'provide_automatic_options', False):
+                    continue
+                func = view if view_class is None else getattr(view_class, method.lower(), None)
+                plan = getattr(func, _PLAN_ATTRIBUTE, None)
+                if plan is not None:
+                    plans[method] = plan
+            if plans and rule.endpoint not in middleware._endpoints:  # rules of an endpoint share the view
+                middleware._endpoints[rule.endpoint] = len(middleware._plans)
+                middleware._plans.append(plans)
+        return middleware
+
+    def add(self, rule: str, params: Iterable[Any], methods: Iterable[str] = ('GET', )) -> None:
+        """
+        :param rule: werkzeug rule, e.g. /users/<int:user_id>
+        :raises WrongUsageError:
+        """
+        plan = _ValidationPlan(tuple(params))
+        self._add_plans(rule, {method.upper(): plan for method in methods})
+
+    def _add_plans(self, rule: str, plans: Dict[str, _ValidationPlan]) -> None:
+        if not plans:
+            raise WrongUsageError(f'no methods of rule {rule}')
+        self._map.add(Rule(rule, endpoint=len(self._plans), methods=list(plans)))
+        self._plans.append(plans)
+
+    def _match(self, request: _BufferedRequest) -> Tuple[int, Dict[str, Any]]:
+        """
+        :raises HTTPException: not found, redirects, etc.
+        """
+        if self._url_adapter is not None:
+            try:
+                endpoint, view_args = self._url_adapter(request).match()
+            except HTTPException:
+                pass  # rules of add()
+            else:
+                index = self._endpoints.get(endpoint)
+                if index is not None:
+                    return index, view_args
+        return self._map.bind_to_environ(request.environ).match()
+
+    def __call__(self, environ: dict, start_response: Callable) -> Any:
+        request = _BufferedRequest(environ, populate_request=False)
+        try:
+            index, view_args = self._match(request)
+        except HTTPException:  # responses of the application
+            return self.app(environ, start_response)
+
+        plan = self._plans[index].get(environ.get('REQUEST_METHOD', 'GET').upper())
+        if plan is None:
+            return self.app(environ, start_response)
+
+        request.view_args = view_args
+        request.max_content_length = self.max_content_length
+        deferred = []
+        try:
+            valid = _validate(plan, request, deferred)
+            self._rewind(request)
+        except HTTPException as e:
+            return e(environ, start_response)
+        except WrongUsageError:
+            raise
+        except RequestError as e:
+            return self.error_handler(e)(environ, start_response)
+
+        environ[VALID_ENVIRON_KEY] = plan, valid, deferred
+        return self.app(environ, start_response)
+
+    @staticmethod
+    def _rewind(request: _BufferedRequest) -> None:
+        """
+        :raises RequestEntityTooLarge: rest of multipart body exceeds max_content_length
+        """
+        spool = request._spool
+        if spool is not None:
+            chunk = request.stream.read(_CHUNK_SIZE)  # epilogue after the last part
+            while chunk:
+                spool.write(chunk)
+                chunk = request.stream.read(_CHUNK_SIZE)
+            size = spool.tell()
+            spool.seek(0)
+            stream = spool
+        else:
+            data = getattr(request, '_cached_data', None)
+            if data is None:
+                return
+            size = len(data)
+            stream = BytesIO(data)  # shares the buffer of data until written
+
+        environ = request.environ
+        environ['wsgi.input'] = stream
+        environ['wsgi.input_terminated'] = True
+        environ['CONTENT_LENGTH'] = str(size)
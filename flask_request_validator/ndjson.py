@@ -0,0 +1,251 @@
+"""
+NDJSON (JSON Lines) validation with JsonParam schemas.
+
+Request bodies (application/x-ndjson) are validated line by line while the view reads them:
+
+    @validate_params(NdJsonParam(JsonParam({'event': [Enum('click', 'view')]})))
+    def collect(valid: ValidRequest):
+        records = valid.get_ndjson()
+        for record in records:  # only valid records
+            save(record)
+        return jsonify(invalid_lines=list(records.errors))
+
+Files:
+
+    $ python -m flask_request_validator.ndjson events.ndjson myapp.schemas:EVENT --workers 8 -o errors.ndjson
+
+The file is memory-mapped and split into chunks on line boundaries. Chunks are
+validated in a process pool, the report has one json line per invalid line:
+
+    {"line": 7, "errors": [{"path": "/user/email", "code": "ValueEmailError", "message": "invalid email address"}]}
+"""
+import json
+import mmap
+import os
+import sys
+from importlib import import_module
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from .exceptions import InvalidJsonError, InvalidRequestError, JsonError
+from .nested_json import JsonParam
+from .rules import _Frozen
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+NDJSON_MIME_TYPES = ('application/x-ndjson', 'application/jsonlines', 'application/jsonl')
+
+_schema = None  # type: JsonParam  # schema of a pool worker
+
+
+def load_schema(reference: str) -> JsonParam:
+    """
+    :param reference: module:attribute, e.g. myapp.schemas:EVENT
+    """
+    module_name, _, attributes = reference.partition(':')
+    if not attributes:
+        raise ValueError(f'invalid schema reference {reference!r}, expected module:attribute')
+
+    schema = import_module(module_name)
+    for attribute in attributes.split('.'):
+        schema = getattr(schema, attribute)
+    return schema
+
+
+def validate_line(schema: JsonParam, line: Union[bytes, str]) -> Tuple[Any, List[Union[JsonError, InvalidJsonError]]]:
+    """
+    :return: validated value and errors of a single json line
+    """
+    try:
+        value = json.loads(line)
+    except ValueError as e:
+        return None, [InvalidJsonError(str(e))]
+    return schema.validate(value)
+
+
+class NdJsonRecords:
+    """
+    Single pass iterator of valid records. Invalid lines are skipped and collected to errors
+    """
+    def __init__(self, schema: JsonParam, stream: Any, max_errors: int = None, max_line_size: int = None) -> None:
+        self._schema = schema
+        self._stream = stream
+        self._max_errors = max_errors
+        self._max_line_size = max_line_size
+        self.errors = dict()  # type: Dict[int, List[Union[JsonError, InvalidJsonError]]]
+        self.lines = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        :raises InvalidRequestError: when errors count is greater than max_errors
+        """
+        limit = -1 if self._max_line_size is None else self._max_line_size + 1
+        while True:
+            line = self._stream.readline(limit)
+            if not line:
+                return
+
+            self.lines += 1
+            if limit != -1 and len(line) == limit and not line.endswith(b'\n'):
+                errors = [InvalidJsonError(f'line is longer than {self._max_line_size} bytes')]
+                while line and not line.endswith(b'\n'):
+                    line = self._stream.readline(limit)
+            elif not line.strip():
+                continue
+            else:
+                value, errors = validate_line(self._schema, line)
+                if not errors:
+                    yield value
+                    continue
+
+            self.errors[self.lines] = errors
+            if self._max_errors is not None and len(self.errors) > self._max_errors:
+                raise InvalidRequestError({}, {}, {}, self.errors, [])
+
+
+class NdJsonParam(_Frozen):
+    """
+    application/x-ndjson request body. Each line is validated by schema, see: NdJsonRecords
+    """
+    def __init__(self, schema: JsonParam, max_errors: int = None, max_line_size: int = None) -> None:
+        """
+        :param schema: schema of a single line
+        :param max_errors: iteration stops with InvalidRequestError when more lines are invalid
+        :param max_line_size: longer lines are invalid and are not decoded
+        """
+        self.schema = schema
+        self.max_errors = max_errors
+        self.max_line_size = max_line_size
+        self._freeze()
+
+    def validate(self, source: Any) -> NdJsonRecords:
+        """
+        :param source: flask.request or object with stream and mimetype
+        :raises InvalidJsonError: unsupported content type
+        """
+        mimetype = getattr(source, 'mimetype', None)
+        if mimetype and mimetype not in NDJSON_MIME_TYPES:
+            raise InvalidJsonError(f'unsupported content type {mimetype}, expected {NDJSON_MIME_TYPES[0]}')
+        return NdJsonRecords(self.schema, source.stream, self.max_errors, self.max_line_size)
+
+
+def split_chunks(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    :param data: bytes or mmap
+    :return: (start, end) offsets. Each chunk ends after a new line or at the end of data
+    """
+    size = len(data)
+    chunks, start = [], 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            new_line = data.find(b'\n', end - 1)
+            end = size if new_line == -1 else new_line + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def _iter_chunk_errors(schema: JsonParam, data: Any, start: int, end: int) -> Tuple[int, list]:
+    """
+    :return: lines count and [(line number in the chunk, error entries), ...]
+    """
+    from .error_formatter import iter_json_errors
+
+    result, line_no, position = [], 0, start
+    while position < end:
+        new_line = data.find(b'\n', position, end)
+        if new_line == -1:
+            new_line = end
+
+        line_no += 1
+        line = data[position:new_line]
+        position = new_line + 1
+        if not line.strip():
+            continue
+
+        _, errors = validate_line(schema, line)
+        if errors:
+            result.append((line_no, list(iter_json_errors(errors))))
+    return line_no, result
+
+
+def _init_worker(schema_reference: str) -> None:
+    global _schema
+    _schema = load_schema(schema_reference)
+
+
+def _validate_chunk(task: Tuple[str, int, int]) -> Tuple[int, list]:
+    path, start, end = task
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return _iter_chunk_errors(_schema, data, start, end)
+
+
+def validate_file(
+    path: str,
+    schema_reference: str,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[int, List[dict]]]:
+    """
+    Yields (line number, error entries) of invalid lines in file order.
+
+    :param schema_reference: module:attribute of JsonParam, importable by workers
+    :param workers: processes count, os.cpu_count() by default. 1 - validation in the current process
+    """
+    if not os.path.getsize(path):
+        return
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        chunks = split_chunks(data, chunk_size)
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    tasks = [(path, start, end) for start, end in chunks]
+    if workers == 1:
+        _init_worker(schema_reference)
+        results = map(_validate_chunk, tasks)
+        yield from _number_lines(results)
+        return
+
+    from multiprocessing import Pool
+
+    with Pool(workers, initializer=_init_worker, initargs=(schema_reference, )) as pool:
+        yield from _number_lines(pool.imap(_validate_chunk, tasks))
+
+
+def _number_lines(results: Iterator[Tuple[int, list]]) -> Iterator[Tuple[int, List[dict]]]:
+    offset = 0
+    for lines_count, chunk_errors in results:
+        for line_no, errors in chunk_errors:
+            yield offset + line_no, errors
+        offset += lines_count
+
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m flask_request_validator.ndjson',
+        description='Validates NDJSON file with JsonParam schema',
+    )
+    parser.add_argument('path', help='NDJSON file')
+    parser.add_argument('schema', help='JsonParam reference module:attribute, e.g. myapp.schemas:EVENT')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='processes count, default: CPU count')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='chunk size in bytes')
+    parser.add_argument('-o', '--output', default='-', help='errors report file, default: stdout')
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    invalid = 0
+    try:
+        for line_no, errors in validate_file(args.path, args.schema, args.workers, args.chunk_size):
+            invalid += 1
+            output.write(json.dumps({'line': line_no, 'errors': errors}) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    sys.stderr.write(f'invalid lines: {invalid}\n')
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
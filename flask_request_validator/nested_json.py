@@ -1,4 +1,5 @@
-from typing import Union, Dict, List, Tuple, Any
+from types import MappingProxyType
+from typing import Union, Dict, Iterable, List, Tuple, Any
 
 from .exceptions import (
     JsonError,
@@ -8,13 +9,101 @@ from .exceptions import (
     JsonListExpectedError,
     JsonDictExpectedError,
     MissingJsonKeyError,
+    UnknownJsonKeyError,
+    WrongUsageError,
 )
-from .rules import CompositeRule, AbstractRule
+from .json_pointer import escape_token
+from .rules import CompositeRule, AbstractRule, Enum, _Frozen
 
 
-class JsonParam:
+class _JsonPath:
     """
-    Nested json validation
+    Linked path of a json node: each level keeps only a parent pointer and a key.
+    Levels of list items (item=True) have an index key: they are in JSON pointers, not in depth lists.
+    Materialized only when an error is recorded, pointers are kept for siblings
+    """
+    __slots__ = ('parent', 'key', 'item', '_pointer')
+
+    def __init__(self, key: Any, parent: '_JsonPath' = None, item: bool = False) -> None:
+        self.parent = parent
+        self.key = key
+        self.item = item
+        self._pointer = None
+
+    @classmethod
+    def from_list(cls, depth: list) -> '_JsonPath':
+        path = None
+        for key in depth:
+            path = cls(key, path)
+        return path
+
+    def to_list(self) -> list:
+        result = []
+        node = self
+        while node is not None:
+            if not node.item:
+                result.append(node.key)
+            node = node.parent
+        result.reverse()
+        return result
+
+    def to_pointer(self) -> str:
+        """
+        JSON pointer of the node relative to the document. The first level is the root of the document
+        """
+        if self._pointer is None:
+            self._pointer = '' if self.parent is None else self.parent.to_pointer() + '/' + escape_token(self.key)
+        return self._pointer
+
+
+_ROOT_PATH = _JsonPath('root')
+_EXTRA_MODES = ('allow', 'strip', 'forbid')
+_MAPPING_ATTRIBUTES = ('rules_map', 'schemas')  # read-only mappings, pickled as dicts
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _with_pointer(error: JsonError, path: _JsonPath) -> JsonError:
+    error.pointer = path.to_pointer()
+    return error
+
+
+def _fingerprint(value: Any) -> Any:
+    """
+    Hashable structure of a json value. Equal for equal values of the same types and key order
+
+    :raises TypeError: value is not json
+    """
+    value_type = type(value)
+    if value_type is str:
+        return value
+    if value_type is dict:
+        return dict, tuple([(key, _fingerprint(item)) for key, item in value.items()])
+    if value_type is list:
+        return list, tuple([_fingerprint(item) for item in value])
+    if value_type in _SCALAR_TYPES:  # 1, 1.0 and True are equal
+        return value_type, value
+    raise TypeError(f'{value_type.__name__} is not json')
+
+
+def _copy_json(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _copy_json(item) for key, item in value.items()}
+    if value_type is list:
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _memo_key(value: Any) -> Any:
+    try:
+        return _fingerprint(value)
+    except TypeError:  # not json, e.g. datetime of cbor bodies
+        return None
+
+
+class JsonParam(_Frozen):
+    """
+    Nested json validation. rules_map is copied to a read-only mapping, public attributes are read-only
     """
     def __init__(
         self,
@@ -24,17 +113,91 @@ class JsonParam:
         ],
         required: bool = True,
         as_list: bool = False,
+        partial: bool = False,
+        extra: str = 'allow',
+        dedupe: int = 0,
     ) -> None:
+        """
+        :param partial: only keys of a value are validated, missing keys are not errors. e.g. PATCH requests
+        :param extra: keys which are not in rules_map.
+                      allow - kept as is, strip - removed from the validated value,
+                      forbid - object is invalid (UnknownJsonKeyError of the first unknown key)
+        :param dedupe: as_list only. Outcomes of up to dedupe distinct items of a list are reused
+                       for identical items, so repeated items are validated once. 0 - off.
+                       Items with errors of nested objects are validated again: pointers of errors differ
+        :raises WrongUsageError:
+        """
+        if extra not in _EXTRA_MODES:
+            raise WrongUsageError(f'invalid JsonParam.extra "{extra}". allowed: {_EXTRA_MODES}')
+
         if isinstance(rules_map, list):
             self.rules_map = CompositeRule(*rules_map)
+        elif isinstance(rules_map, dict):
+            self.rules_map = MappingProxyType({
+                k: CompositeRule(*rules) if isinstance(rules, list) else rules
+                for k, rules in rules_map.items()
+            })
         else:
-            for k, rules in rules_map.items():
-                if isinstance(rules, list):
-                    rules_map[k] = CompositeRule(*rules)
             self.rules_map = rules_map
 
         self.required = required
         self.as_list = as_list  # JsonParam is list or dict
+        self.partial = partial
+        self.extra = extra
+        self.dedupe = dedupe
+        self._index_keys()
+        self._freeze()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name, value in state.items():
+            if isinstance(value, MappingProxyType):  # not picklable
+                state[name] = dict(value)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(partial=False, extra='allow', dedupe=0, _frozen=True)  # pickled by older versions
+        self.__dict__.update({
+            name: MappingProxyType(value) if name in _MAPPING_ATTRIBUTES and isinstance(value, dict) else value
+            for name, value in state.items()
+        })
+        self._index_keys()
+
+    def _index_keys(self) -> None:
+        """
+        Key sets of an object schema, so absent optional keys are skipped without lookups
+        """
+        if not isinstance(self.rules_map, MappingProxyType):
+            return
+
+        self._keys = tuple(self.rules_map)
+        self._optional_keys = frozenset(
+            key for key, rules in self.rules_map.items()
+            if isinstance(rules, JsonParam) and not rules.required
+        )
+        self._required_objects = tuple(
+            key for key, rules in self.rules_map.items()
+            if isinstance(rules, JsonParam) and rules.required
+        )
+
+    def _keys_to_validate(self, value: Dict) -> Iterable[str]:
+        """
+        Schema keys in schema order: required keys and keys of the value.
+        One pass over the schema keys, without sorting
+        """
+        if self.partial:
+            return [key for key in self._keys if key in value]
+
+        optional = self._optional_keys
+        if not optional:
+            return self._keys
+        return [key for key in self._keys if key not in optional or key in value]
+
+    def _resolve(self, value: Dict) -> 'JsonParam':
+        """
+        Schema of a dict value, see: DiscriminatedJsonParam
+        """
+        return self
 
     def _check_list_item_type(self, nested: 'JsonParam', value: Any):
         """
@@ -46,7 +209,7 @@ class JsonParam:
             if not isinstance(value, (str, int, float, bool,)):
                 raise JsonListItemTypeError(False)
             return
-        if isinstance(nested.rules_map, dict) and not isinstance(value, dict):
+        if isinstance(nested.rules_map, MappingProxyType) and not isinstance(value, dict):
             raise JsonListItemTypeError()
 
     def _is_missing_json_key(self, key: str, value: Dict, nested: 'JsonParam'):
@@ -64,10 +227,15 @@ class JsonParam:
         self,
         value: Union[Dict, List],
         nested: 'JsonParam',
-        depth: list,
+        depth: _JsonPath,
         errors: List[JsonError],
+        builder: Any = None,
     ) -> Tuple[Union[Dict, List], List]:
+        if isinstance(nested.rules_map, CompositeRule):
+            return self._validate_scalar_list(value, nested, depth, errors)
+
         n_err = {}
+        memo = {}  # fingerprint -> value, errors and rules errors of the item, see: dedupe
         for ix, node in enumerate(value):  # type: int, dict or list
             try:
                 self._check_list_item_type(nested, node)
@@ -75,34 +243,100 @@ class JsonParam:
                 n_err[ix] = e
                 continue
 
-            if isinstance(node, dict):
-                item_value, errors, rules_err = self._validate_dict(node, nested, depth, errors)
-                if rules_err:
-                    n_err[ix] = rules_err
-                else:
-                    value[ix] = item_value
-                continue
+            key = _memo_key(node) if nested.dedupe else None
+            outcome = memo.get(key) if key is not None else None
+            if outcome is None:
+                errors_count = len(errors)
+                item_path = _JsonPath(ix, depth, True)
+                item_value, errors, rules_err = self._validate_dict(
+                    node, nested._resolve(node), item_path, errors, builder,
+                )
+                # errors of nested objects have pointers of the item, so such outcomes are not reused
+                if key is not None and len(memo) < nested.dedupe and len(errors) == errors_count:
+                    unchanged = _memo_key(item_value) == key
+                    memo[key] = None if unchanged else item_value, rules_err
+            else:
+                item_value, rules_err = outcome
+                item_value = node if item_value is None else _copy_json(item_value)  # None - valid as is
+                if builder is not None and not rules_err:
+                    builder.convert(nested._resolve(node), item_value)
 
-            try:
-                new_val = nested.rules_map.validate(value[ix])
-                value[ix] = new_val
-            except RulesError as e:
-                n_err[ix] = e
+            if rules_err:
+                n_err[ix] = rules_err
+            else:
+                value[ix] = item_value
 
         if n_err:
             errors = self._collect_errors(depth, errors, n_err, nested.as_list)
         return value, errors
 
+    def _validate_scalar_list(
+        self,
+        value: List,
+        nested: 'JsonParam',
+        depth: _JsonPath,
+        errors: List[JsonError],
+    ) -> Tuple[List, List]:
+        """
+        Items are validated by rules at once, see: AbstractRule.validate_batch
+        """
+        n_err = {}
+        indexes = []
+        for ix, node in enumerate(value):
+            if node is None or isinstance(node, (str, int, float, bool,)):
+                indexes.append(ix)
+            else:
+                n_err[ix] = JsonListItemTypeError(False)
+
+        items = [value[ix] for ix in indexes]
+        if nested.dedupe:
+            results, rules_errors = self._validate_distinct(items, nested)
+        else:
+            results, rules_errors = nested.rules_map.validate_batch(items)
+        for pos, ix in enumerate(indexes):
+            if pos in rules_errors:
+                n_err[ix] = rules_errors[pos]
+            else:
+                value[ix] = results[pos]
+
+        if n_err:
+            errors = self._collect_errors(depth, errors, dict(sorted(n_err.items())), nested.as_list)
+        return value, errors
+
+    def _validate_distinct(self, items: List, nested: 'JsonParam') -> Tuple[List, Dict[int, RulesError]]:
+        """
+        Identical scalars are validated once, up to nested.dedupe distinct scalars
+        """
+        positions = {}  # (type, item) -> position of the first item in distinct
+        distinct, item_positions = [], []
+        for item in items:
+            key = type(item), item
+            position = positions.get(key)
+            if position is None:
+                position = len(distinct)
+                distinct.append(item)
+                if len(positions) < nested.dedupe:
+                    positions[key] = position
+            item_positions.append(position)
+
+        if len(distinct) == len(items):
+            return nested.rules_map.validate_batch(items)
+
+        results, rules_errors = nested.rules_map.validate_batch(distinct)
+        return [results[position] for position in item_positions], {
+            ix: rules_errors[position] for ix, position in enumerate(item_positions) if position in rules_errors
+        }
+
     def _collect_errors(
         self,
-        depth: list,
+        depth: _JsonPath,
         errors: list,
         nested_errors: dict,
         as_list: bool = False,
     ) -> list:
         if nested_errors:
             try:
-                raise JsonError(depth, nested_errors, as_list)
+                raise _with_pointer(JsonError(depth.to_list(), nested_errors, as_list), depth)
             except JsonError as e:
                 errors.append(e)
         return errors
@@ -111,12 +345,22 @@ class JsonParam:
         self,
         value: Union[Dict, List],
         nested: 'JsonParam',
-        depth: list,
+        depth: _JsonPath,
         errors: List[JsonError],
+        builder: Any = None,
     ) -> Tuple[Any, List[JsonError], Dict[str, RulesError]]:
         err = dict()
 
-        for key, rules in nested.rules_map.items():
+        rules_map = nested.rules_map
+        if nested.extra == 'forbid':
+            for key in value:
+                if key not in rules_map:
+                    err[key] = RulesError(UnknownJsonKeyError(key))
+                    return value, errors, err
+
+        keys = nested._keys_to_validate(value)
+        for key in keys:
+            rules = rules_map[key]
             try:
                 self._is_missing_json_key(key, value, nested)
             except RulesError as e:
@@ -128,7 +372,8 @@ class JsonParam:
                 if key_value is None and not nested.rules_map[key].required:
                     continue
 
-                new_val, errors = self.validate(key_value, rules, depth + [key], errors)
+                new_val, errors = self.validate(key_value, rules, _JsonPath(key, depth), errors, builder)
+                value[key] = new_val
             else:
                 try:
                     new_val = rules.validate(key_value)
@@ -136,6 +381,10 @@ class JsonParam:
                 except RulesError as e:
                     err[key] = e
 
+        if nested.extra == 'strip':
+            value = {key: value[key] for key in keys if key in value}
+        if builder is not None:
+            builder.add(nested, value)
         return value, errors, err
 
     def _check_required(self, key: str, value: dict, rule: Any):
@@ -145,20 +394,27 @@ class JsonParam:
         if isinstance(rule, JsonParam) and rule.required and key not in value:
             raise RequiredJsonKeyError(key)
 
-    def _check_as_list_value(self, nested: 'JsonParam', value: Any, depth: list):
+    def _check_as_list_value(self, nested: 'JsonParam', value: Any, depth: _JsonPath):
         if nested.as_list and not isinstance(value, list):
-            raise JsonListExpectedError(depth)
+            raise _with_pointer(JsonListExpectedError(depth.to_list()), depth)
         if not nested.as_list and not isinstance(value, dict):
-            raise JsonListExpectedError(depth)
+            raise _with_pointer(JsonListExpectedError(depth.to_list()), depth)
 
     def validate(
         self,
         value: Union[Dict, List],
         nested: 'JsonParam' = None,
-        depth: list = None,
+        depth: Union[_JsonPath, list] = None,
         errors: List[JsonError] = None,
+        builder: Any = None,
     ) -> Tuple[Union[Dict, List], List]:
-        depth = depth or ['root']
+        """
+        :param builder: receives each validated object, see: typed._JsonBuilder
+        """
+        if not depth:
+            depth = _ROOT_PATH
+        elif isinstance(depth, list):
+            depth = _JsonPath.from_list(depth)
         errors = errors or []
         node_errors = dict()
         nested = nested or self
@@ -170,17 +426,58 @@ class JsonParam:
             return value, errors
 
         if nested.as_list:
-            value, errors = self._validate_list(value, nested, depth, errors)
+            value, errors = self._validate_list(value, nested, depth, errors, builder)
             return value, errors
 
-        if isinstance(nested.rules_map, dict):
-            for key, rule in nested.rules_map.items():
+        nested = nested._resolve(value)
+        if isinstance(nested.rules_map, MappingProxyType) and not nested.partial:
+            for key in nested._required_objects:
                 try:
-                    self._check_required(key, value, rule)
+                    self._check_required(key, value, nested.rules_map[key])
                 except RequiredJsonKeyError as e:
                     node_errors[key] = e
 
-        value, errors, nested_errors = self._validate_dict(value, nested, depth, errors)
+        value, errors, nested_errors = self._validate_dict(value, nested, depth, errors, builder)
         node_errors.update(nested_errors)
         errors = self._collect_errors(depth, errors, node_errors)
         return value, errors
+
+
+class DiscriminatedJsonParam(JsonParam):
+    """
+    Polymorphic json object (or list of objects). The schema is selected by a value of the key,
+    so each object is validated once:
+
+        DiscriminatedJsonParam('type', {
+            'click': JsonParam({'type': [Enum('click')], 'x': [IntRule()], 'y': [IntRule()]}),
+            'view': JsonParam({'type': [Enum('view')], 'page': [MinLength(1)]}),
+        }, as_list=True)
+
+    Objects with an unknown or missing key are invalid: ValueEnumError / MissingJsonKeyError of the key
+    """
+    def __init__(
+        self,
+        key: str,
+        schemas: Dict[Any, JsonParam],
+        required: bool = True,
+        as_list: bool = False,
+        dedupe: int = 0,
+    ) -> None:
+        """
+        :param key: discriminator
+        :param schemas: object schemas by values of the key
+        :raises WrongUsageError: schema is not an object schema
+        """
+        for schema in schemas.values():
+            if not isinstance(schema, JsonParam) or schema.as_list or not isinstance(schema.rules_map, MappingProxyType):
+                raise WrongUsageError(f'DiscriminatedJsonParam.key = "{key}". schemas should be JsonParam of objects')
+
+        self.key = key
+        self.schemas = MappingProxyType(dict(schemas))
+        super().__init__({key: CompositeRule(Enum(*schemas))}, required, as_list, dedupe=dedupe)
+
+    def _resolve(self, value: Dict) -> JsonParam:
+        try:
+            return self.schemas.get(value.get(self.key), self)
+        except TypeError:  # unhashable value of the key
+            return self
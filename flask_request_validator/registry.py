@@ -0,0 +1,211 @@
+import hashlib
+import pickle
+from copy import copy
+from types import MappingProxyType
+from typing import Any, Dict, Tuple
+
+from .after_param import AbstractAfterParam
+from .exceptions import WrongUsageError
+from .files import File, FileChain
+from .nested_json import JsonParam
+from .rules import AbstractRule, CompositeRule
+from .validator import Param, validate_params
+
+_SCALARS = (type(None), bool, int, float, complex, str, bytes)
+_SCHEMA_TYPES = (Param, JsonParam, File, FileChain, AbstractRule)
+
+
+class SchemaRegistry:
+    """
+    Content-addressed storage of Param, JsonParam, File, FileChain and rules.
+    Structurally identical schemas (and their nested parts) are stored once
+    and shared by all endpoints.
+
+        schemas = SchemaRegistry()
+
+        @app.route('/users')
+        @schemas.validate_params(Param('page', GET, int, required=False, default=1))
+        def users(valid: ValidRequest):
+            ...
+
+        schemas.save('schemas.pickle')  # build step
+        schemas = SchemaRegistry.load('schemas.pickle')  # workers start with prebuilt schemas
+
+    Schemas added by name are found without building and fingerprinting them again:
+
+        schemas.add('users.page', Param('page', GET, int, required=False, default=1))  # build step
+
+        @schemas.validate_params('users.page', cache=LRUCache())  # str - name of a registered schema
+
+    Objects with lambda defaults or custom attributes which can't be compared
+    by value are registered by identity and are not saved.
+    Load only files you created: pickle is not secure against malicious data.
+    """
+    def __init__(self) -> None:
+        self._objects = dict()  # type: Dict[str, Any]
+        self._persistent = set()
+        self._names = dict()  # type: Dict[str, str]
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __contains__(self, obj: Any) -> bool:
+        return self.digest(obj) in self._objects
+
+    def digest(self, obj: Any) -> str:
+        fingerprint, _ = _fingerprint(obj, dict())
+        return hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+    def intern(self, obj: Any) -> Any:
+        """
+        Returns registered object which is structurally identical to obj.
+        Registers obj when nothing was found. obj is not changed: when its parts are found in the registry,
+        a copy of obj with registered parts is registered instead.
+        Adaptive CompositeRule (and schemas with them) keep statistics of an endpoint, they are returned as is
+        """
+        registered, _ = self._intern(obj, dict())
+        return registered
+
+    def _intern(self, obj: Any, memo: Dict[int, Tuple[Any, Tuple[Any, bool]]]) -> Tuple[Any, bool]:
+        """
+        :return: registered object, False - obj has adaptive rules and is not registered
+        """
+        if not isinstance(obj, _SCHEMA_TYPES):
+            return obj, True
+        if isinstance(obj, CompositeRule) and obj._adaptive:
+            return obj, False
+
+        shared = True
+        changed = dict()  # attribute -> value with registered parts
+        if isinstance(obj, Param):
+            rules, shared = self._intern(obj.rules, memo)
+            if rules is not obj.rules:
+                changed['rules'] = rules
+        elif isinstance(obj, JsonParam):
+            if isinstance(obj.rules_map, MappingProxyType):
+                rules_map = dict()
+                for key, rules in obj.rules_map.items():
+                    rules_map[key], key_shared = self._intern(rules, memo)
+                    shared = shared and key_shared
+                if any(rules_map[key] is not rules for key, rules in obj.rules_map.items()):
+                    changed['rules_map'] = MappingProxyType(rules_map)
+            else:
+                rules_map, shared = self._intern(obj.rules_map, memo)
+                if rules_map is not obj.rules_map:
+                    changed['rules_map'] = rules_map
+        elif isinstance(obj, CompositeRule):
+            rules = []
+            for rule in obj._rules:
+                registered, rule_shared = self._intern(rule, memo)
+                rules.append(registered)
+                shared = shared and rule_shared
+            if any(registered is not rule for registered, rule in zip(rules, obj._rules)):
+                changed['_rules'] = tuple(rules)
+
+        if not shared:
+            return obj, False
+        if changed:
+            obj = copy(obj)  # pickle state, so lazily filled caches are not copied
+            obj.__dict__.update(changed)
+
+        fingerprint, persistent = _fingerprint(obj, memo)
+        digest = hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+        registered = self._objects.setdefault(digest, obj)
+        if persistent:
+            self._persistent.add(digest)
+        return registered, True
+
+    def add(self, name: str, obj: Any) -> Any:
+        """
+        Registers obj by name, see: get
+
+        :raises WrongUsageError: obj has adaptive rules
+        """
+        registered, shared = self._intern(obj, dict())
+        if not shared:
+            raise WrongUsageError(f'schema "{name}" has adaptive rules, they keep statistics of an endpoint')
+        self._names[name] = self.digest(registered)
+        return registered
+
+    def get(self, name: str) -> Any:
+        """
+        :raises WrongUsageError: name is not registered
+        """
+        digest = self._names.get(name)
+        if digest is None:
+            raise WrongUsageError(f'schema "{name}" is not registered')
+        return self._objects[digest]
+
+    def validate_params(self, *params: Any, **kwargs: Any):
+        """
+        validate_params with registered schemas. str params are names of schemas, see: add
+
+        :param kwargs: keyword arguments of validate_params, e.g. typed, cache
+        """
+        return validate_params(*[
+            self.get(param) if isinstance(param, str)
+            else param if isinstance(param, AbstractAfterParam) else self.intern(param)
+            for param in params
+        ], **kwargs)
+
+    def save(self, path: str) -> None:
+        objects = {digest: self._objects[digest] for digest in self._persistent}
+        names = {name: digest for name, digest in self._names.items() if digest in self._persistent}
+        with open(path, 'wb') as f:
+            pickle.dump((objects, names), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SchemaRegistry':
+        registry = cls()
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        # files of older versions have no names
+        registry._objects, registry._names = (data, dict()) if isinstance(data, dict) else data
+        registry._persistent = set(registry._objects)
+        return registry
+
+
+def _state(obj: Any) -> dict:
+    """
+    Pickle state, so lazily filled caches (compiled patterns, etc.) are not a part of a fingerprint
+    """
+    getstate = getattr(obj, '__getstate__', None)
+    state = getstate() if getstate is not None else None
+    return state if isinstance(state, dict) else vars(obj)
+
+
+def _fingerprint(obj: Any, memo: Dict[int, Tuple[Any, Tuple[Any, bool]]]) -> Tuple[Any, bool]:
+    """
+    :return: hashable structure of obj and True when it doesn't depend on object identity
+    """
+    if isinstance(obj, _SCALARS):
+        return (type(obj).__name__, obj), True
+
+    key = id(obj)
+    if key in memo:
+        return memo[key][1]
+
+    if isinstance(obj, (list, tuple)):
+        items = [_fingerprint(item, memo) for item in obj]
+        result = (type(obj).__name__, tuple(fp for fp, _ in items)), all(p for _, p in items)
+    elif isinstance(obj, (set, frozenset)):
+        items = [_fingerprint(item, memo) for item in obj]
+        result = ('set', tuple(sorted((fp for fp, _ in items), key=repr))), all(p for _, p in items)
+    elif isinstance(obj, dict):
+        items = [(_fingerprint(k, memo), _fingerprint(v, memo)) for k, v in obj.items()]
+        result = (
+            ('dict', tuple((k[0], v[0]) for k, v in items)),
+            all(k[1] and v[1] for k, v in items),
+        )
+    elif isinstance(obj, type):
+        result = ('type', obj.__module__, obj.__qualname__), True
+    elif hasattr(obj, 'pattern') and hasattr(obj, 'flags') and hasattr(obj, 'groupindex'):
+        result = ('re', obj.pattern, obj.flags), True
+    elif isinstance(obj, _SCHEMA_TYPES) and hasattr(obj, '__dict__'):
+        attrs, persistent = _fingerprint(dict(sorted(_state(obj).items())), memo)
+        result = ('obj', type(obj).__module__, type(obj).__qualname__, attrs), persistent
+    else:
+        result = ('id', key), False
+
+    memo[key] = obj, result  # keeps obj alive, so id(obj) can't be reused during the walk
+    return result
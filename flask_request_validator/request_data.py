@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Mapping
+
+
+class _MultiValues:
+    """
+    Read-only view of a plain mapping with werkzeug MultiDict methods used by Param.
+    Values can be scalars or lists of repeated values: {'tag': ['a', 'b'], 'page': '1'}
+    """
+    __slots__ = ('_data', )
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self._data = data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._data.get(key, default)
+        if isinstance(value, (list, tuple)):
+            return value[0] if value else default
+        return value
+
+    def getlist(self, key: str) -> List[Any]:
+        value = self._data.get(key)
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return value
+        if isinstance(value, tuple):
+            return list(value)
+        return [value]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _Headers:
+    """
+    Case-insensitive headers
+    """
+    __slots__ = ('_data', )
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self._data = {key.lower(): value for key, value in data.items()}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key.lower(), default)
+
+    def __contains__(self, key: str) -> bool:
+        return key.lower() in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RequestData:
+    """
+    Request data from plain mappings for validation without flask request context
+    (queue consumers, workers, scripts). Has the same interface as flask.request for validators.
+
+        valid = validate_request(
+            (Param('page', GET, int), JsonParam({'name': [MinLength(1)]})),
+            RequestData(args={'page': '2'}, json={'name': 'Bob'}),
+        )
+    """
+    def __init__(
+        self,
+        args: Mapping[str, Any] = None,
+        form: Mapping[str, Any] = None,
+        view_args: Dict[str, Any] = None,
+        headers: Mapping[str, Any] = None,
+        json: Any = None,
+        files: Mapping[str, Any] = None,
+        stream: Any = None,
+        mimetype: str = None,
+        data: bytes = b'',
+    ) -> None:
+        """
+        :param args: GET params. werkzeug MultiDict or mapping with scalar or list values
+        :param form: FORM params. werkzeug MultiDict or mapping with scalar or list values
+        :param view_args: PATH params
+        :param headers: HEADER params. werkzeug Headers or mapping. Lookup is case-insensitive
+        :param json: decoded json body
+        :param files: files by field name, werkzeug FileStorage or objects with the same interface
+        :param stream: binary file-like body, see: NdJsonParam
+        :param mimetype: content type of body without parameters
+        :param data: raw body, decoded by mimetype. see: bodies.BODY_DECODERS
+        """
+        self.args = _multi_values(args)
+        self.form = _multi_values(form)
+        self.view_args = view_args or dict()
+        self.headers = headers if hasattr(headers, 'getlist') else _Headers(headers or dict())
+        self.files = files or dict()
+        self.stream = stream
+        self.mimetype = mimetype
+        self._json = json
+        self._data = data
+
+    def get_json(self) -> Any:
+        return self._json
+
+    def get_data(self) -> bytes:
+        return self._data
+
+
+def _multi_values(data: Mapping[str, Any] = None) -> Any:
+    if hasattr(data, 'getlist'):
+        return data
+    return _MultiValues(data or dict())
@@ -4,11 +4,38 @@ import sys
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from .dt_utils import dt_from_iso
 from .exceptions import *
 
 REGEX_EMAIL = r"[^@\s]+@[^@\s]+\.[a-zA-Z0-9]+$"
+_email_regex = None
+_IMMUTABLE_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+_FAILED = object()
+
+
+class _Frozen:
+    """
+    Public attributes are read-only after _freeze(), so schemas are shared by threads without locks.
+    Private attributes are caches (compiled patterns, fused rules, etc.): they are built lazily
+    and any thread may build them again
+    """
+    _frozen = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen and not name.startswith('_'):
+            raise AttributeError(f'{type(self).__name__}.{name} is read-only, validators are immutable')
+        super().__setattr__(name, value)
+
+    def _freeze(self) -> None:
+        self._frozen = True
+
+    def _assign(self, name: str, value: Any) -> None:
+        """
+        Replaces an attribute of a frozen object by an equal value, see: SchemaRegistry
+        """
+        object.__setattr__(self, name, value)
 
 
 class AbstractRule(ABC):
@@ -25,27 +52,91 @@ class AbstractRule(ABC):
         """
         pass
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RequestError]]:
+        """
+        Validates values one by one. Built-in rules check all values in a loop without raising errors.
+
+        :return: results (invalid values are returned as is), errors by index of values
+        """
+        results, errors = [], {}
+        for ix, value in enumerate(values):
+            try:
+                value = self.validate(value)
+            except (TypeConversionError, RuleError) as e:
+                errors[ix] = e
+            results.append(value)
+        return results, errors
+
 
 class CompositeRule(AbstractRule):
-    def __init__(self, *rules: AbstractRule) -> None:
+    def __init__(self, *rules: AbstractRule, fail_fast: bool = False, adaptive: bool = False) -> None:
+        """
+        :param fail_fast: validation stops on the first error
+        :param adaptive: fail_fast checks are reordered by observed failure rates and costs,
+                         the error is the first error of declared order. see: _AdaptiveOrder
+        :raises WrongUsageError:
+        """
+        if adaptive and not fail_fast:
+            raise WrongUsageError('adaptive order is only used with fail_fast')
+
         type_checkers = (Number, BoolRule, IntRule, FloatRule)
         rules_by_priority = sorted(rules, key=lambda x: 0 if isinstance(x, type_checkers) else 1)
         if len(rules_by_priority) > 1 and isinstance(rules_by_priority[1], type_checkers):
             raise WrongUsageError(f'You can use only 1 type. '
                                   f'Choose one of: {", ".join([t.__name__ for t in type_checkers])}')
 
-        self._rules = rules_by_priority
+        self._rules = tuple(rules_by_priority)
+        self._fail_fast = fail_fast
+        self._adaptive = adaptive
+        self._fast_path = None
+        self._fast_path_rules = None
+        self._adaptive_order = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_fast_path'] = state['_fast_path_rules'] = state['_adaptive_order'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(  # pickled by older versions
+            _fail_fast=False,
+            _adaptive=False,
+            _fast_path=None,
+            _fast_path_rules=None,
+            _adaptive_order=None,
+        )
+        self.__dict__.update(state)
+        self._rules = tuple(self._rules)
 
     def __iter__(self):
         for rule in self._rules:
             yield rule
 
+    def _get_fast_path(self) -> '_FastPath':
+        if self._fast_path_rules is not self._rules:
+            self._fast_path = _FastPath.build(self._rules)
+            self._fast_path_rules = self._rules
+        return self._fast_path
+
     def validate(self, value: Any) -> Any:
         """
+        Valid values are checked by fused rules, see: _FastPath.
+        Errors are collected by the rules as declared.
+        fail_fast rules don't use fused rules: invalid values would be checked twice
+
         :raises RulesError:
         """
+        new_value = value if type(value) in _IMMUTABLE_TYPES else deepcopy(value)
+        if self._fail_fast:
+            return self._validate_fail_fast(new_value)
+
+        fast_path = self._get_fast_path()
+        if fast_path is not None:
+            result = fast_path.validate(new_value)
+            if result is not _FAILED:
+                return result
+
         errors = []
-        new_value = deepcopy(value)
         for rule in self._rules:
             try:
                 new_value = rule.validate(value=new_value)
@@ -59,16 +150,135 @@ class CompositeRule(AbstractRule):
             raise RulesError(*errors)
         return new_value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RulesError]]:
+        """
+        Each rule checks all values which are not rejected yet: values with TypeConversionError,
+        with any error when fail_fast. Errors are the same as errors of validate()
+        """
+        results = [value if type(value) in _IMMUTABLE_TYPES else deepcopy(value) for value in values]
+        errors = {}  # type: Dict[int, List[RequestError]]
+        indexes = list(range(len(results)))
+        for rule in self._rules:
+            if not indexes:
+                break
+            batch, batch_errors = rule.validate_batch([results[ix] for ix in indexes])
+            if not batch_errors:
+                for ix, new_value in zip(indexes, batch):
+                    results[ix] = new_value
+                continue
+
+            passed = []
+            for pos, ix in enumerate(indexes):
+                error = batch_errors.get(pos)
+                if error is None:
+                    results[ix] = batch[pos]
+                    passed.append(ix)
+                    continue
+                errors.setdefault(ix, []).append(error)
+                if not self._fail_fast and not isinstance(error, TypeConversionError):
+                    passed.append(ix)
+            indexes = passed
+
+        return results, {ix: RulesError(*ix_errors) for ix, ix_errors in sorted(errors.items())}
+
+    def _validate_fail_fast(self, value: Any) -> Any:
+        """
+        :raises RulesError: with the first error
+        """
+        try:
+            if not self._adaptive:
+                for rule in self._rules:
+                    value = rule.validate(value=value)
+                return value
+
+            order = self._adaptive_order
+            if order is None or order.rules is not self._rules:
+                order = self._adaptive_order = _AdaptiveOrder(self._rules)
+            return order.validate(value)
+        except (TypeConversionError, RuleError) as e:
+            raise RulesError(e)
+
 
 class Pattern(AbstractRule):
-    def __init__(self, pattern: str) -> None:
-        self._pattern = re.compile(pattern)
+    """
+    The pattern is compiled when the rule is created, so syntax errors are raised as WrongUsageError
+    when the schema is defined. Unpickled rules (e.g. of SchemaRegistry.load) compile the pattern on first validation.
+
+    linear=True - pattern is compiled by re2 (pip install flask_request_validator[re2]) when the rule
+    is created and is matched in linear time. Patterns which re2 doesn't support (backreferences,
+    lookarounds) are refused with WrongUsageError
+    """
+    def __init__(self, pattern: str, max_length: int = None, linear: bool = False) -> None:
+        """
+        :param max_length: longer values are invalid and are not matched
+        :raises WrongUsageError: invalid pattern, linear pattern without re2 or pattern which re2 doesn't support
+        """
+        self._raw_pattern = pattern
+        self._max_length = max_length
+        self._linear = linear
+        self._compiled = None
+        if linear:
+            re2 = _re2()
+            if re2 is None:
+                raise WrongUsageError(f'linear pattern {pattern!r} requires google-re2')
+            try:
+                self._compiled = re2.compile(pattern)
+            except Exception as e:
+                raise WrongUsageError(f'linear pattern {pattern!r} is not supported by re2: {e}')
+        else:
+            try:
+                self._compiled = re.compile(pattern)
+            except re.error as e:
+                raise WrongUsageError(f'invalid pattern {pattern!r}: {e}')
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(_max_length=None, _linear=False)  # pickled by older versions
+        self.__dict__.update(state)
+
+    @property
+    def _pattern(self) -> 're.Pattern':
+        if self._compiled is None:
+            engine = _re2() if self._linear else re
+            if engine is None:  # unpickled without re2
+                raise WrongUsageError(f'linear pattern {self._raw_pattern!r} requires google-re2')
+            try:
+                self._compiled = engine.compile(self._raw_pattern)
+            except re.error as e:
+                raise WrongUsageError(f'invalid pattern {self._raw_pattern!r}: {e}')
+        return self._compiled
 
     def validate(self, value: str) -> str:
-        if not self._pattern.search(string=str(value)):
-            raise ValuePatternError(self._pattern.pattern)
+        value_str = str(value)
+        if self._max_length is not None and len(value_str) > self._max_length:
+            raise ValueMaxLengthError(self._max_length)
+        if not self._pattern.search(value_str):
+            raise ValuePatternError(self._raw_pattern)
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        search, max_length = self._pattern.search, self._max_length
+        errors = {}
+        for ix, value in enumerate(values):
+            value_str = value if type(value) is str else str(value)
+            if max_length is not None and len(value_str) > max_length:
+                errors[ix] = ValueMaxLengthError(max_length)
+            elif not search(value_str):
+                errors[ix] = ValuePatternError(self._raw_pattern)
+        return list(values), errors
+
+
+def _re2() -> Any:
+    try:
+        import re2
+    except ImportError:
+        return None
+    return re2
+
 
 class Enum(AbstractRule):
     def __init__(self, *allowed_values: Any) -> None:
@@ -79,6 +289,18 @@ class Enum(AbstractRule):
             raise ValueEnumError(self._allowed_values)
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        contains = _membership(self._allowed_values)
+        errors = {}
+        for ix, value in enumerate(values):
+            try:
+                allowed = contains(value)
+            except TypeError:  # unhashable value
+                allowed = value in self._allowed_values
+            if not allowed:
+                errors[ix] = ValueEnumError(self._allowed_values)
+        return list(values), errors
+
 
 class MaxLength(AbstractRule):
     def __init__(self, length: int) -> None:
@@ -89,6 +311,10 @@ class MaxLength(AbstractRule):
             raise ValueMaxLengthError(self._length)
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        length = self._length
+        return list(values), {ix: ValueMaxLengthError(length) for ix, value in enumerate(values) if len(value) > length}
+
 
 class MinLength(AbstractRule):
     def __init__(self, length: int) -> None:
@@ -99,6 +325,10 @@ class MinLength(AbstractRule):
             raise ValueMinLengthError(self._length)
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        length = self._length
+        return list(values), {ix: ValueMinLengthError(length) for ix, value in enumerate(values) if len(value) < length}
+
 
 class NotEmpty(AbstractRule):
     def validate(self, value: str) -> str:
@@ -107,6 +337,15 @@ class NotEmpty(AbstractRule):
             raise ValueEmptyError()
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        results = [value.strip() for value in values]
+        errors = {}
+        for ix, value in enumerate(results):
+            if value == '':
+                errors[ix] = ValueEmptyError()
+                results[ix] = values[ix]
+        return results, errors
+
 
 class Max(AbstractRule):
     def __init__(self, value: Union[int, float], include_boundary: bool = True) -> None:
@@ -165,10 +404,22 @@ class IsDatetimeIsoFormat(AbstractRule):
 
 class IsEmail(AbstractRule):
     def validate(self, value: str) -> str:
-        if not re.fullmatch(pattern=REGEX_EMAIL, string=value):
+        global _email_regex
+        if _email_regex is None:
+            _email_regex = re.compile(REGEX_EMAIL)
+
+        if not _email_regex.fullmatch(string=value):
             raise ValueEmailError()
         return value
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        global _email_regex
+        if _email_regex is None:
+            _email_regex = re.compile(REGEX_EMAIL)
+
+        fullmatch = _email_regex.fullmatch
+        return list(values), {ix: ValueEmailError() for ix, value in enumerate(values) if not fullmatch(value)}
+
 
 class Datetime(AbstractRule):
     def __init__(self, dt_format: str) -> None:
@@ -180,6 +431,17 @@ class Datetime(AbstractRule):
         except ValueError:
             raise ValueDatetimeError(self._dt_format)
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, RuleError]]:
+        strptime, dt_format = datetime.strptime, self._dt_format
+        results, errors = [], {}
+        for ix, value in enumerate(values):
+            try:
+                value = strptime(value, dt_format)
+            except ValueError:
+                errors[ix] = ValueDatetimeError(dt_format)
+            results.append(value)
+        return results, errors
+
 
 class Number(AbstractRule):
     def validate(self, value: Any) -> Any:
@@ -195,14 +457,20 @@ class IntRule(AbstractRule):
     >>> IntRule().validate('7')
     7   # int
     """
-    def __init__(self, str_to_int: bool = True) -> None:
+    def __init__(self, str_to_int: bool = True, max_length: int = None) -> None:
+        """
+        :param max_length: longer strings are not converted. int(str) is quadratic for long strings
+        """
         self._str_to_int = str_to_int
+        self._max_length = max_length
 
     def validate(self, value: Any) -> Any:
         if isinstance(value, int):
             return value
 
         if isinstance(value, str) and self._str_to_int:
+            if self._max_length is not None and len(value) > self._max_length:
+                raise TypeConversionError()
             try:
                 return int(value)
             except ValueError:
@@ -210,6 +478,23 @@ class IntRule(AbstractRule):
 
         raise TypeConversionError()
 
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, TypeConversionError]]:
+        str_to_int, max_length = self._str_to_int, self._max_length
+        results, errors = [], {}
+        for ix, value in enumerate(values):
+            if isinstance(value, int):
+                results.append(value)
+                continue
+            if str_to_int and isinstance(value, str) and (max_length is None or len(value) <= max_length):
+                try:
+                    results.append(int(value))
+                    continue
+                except ValueError:
+                    pass
+            errors[ix] = TypeConversionError()
+            results.append(value)
+        return results, errors
+
 
 class FloatRule(AbstractRule):
     """
@@ -218,14 +503,20 @@ class FloatRule(AbstractRule):
     >>> FloatRule({','}).validate('9.99')
     9.99   # float
     """
-    def __init__(self, delimiters: set = None) -> None:
-        self._delimiters = delimiters or {}
+    def __init__(self, delimiters: set = None, max_length: int = None) -> None:
+        """
+        :param max_length: longer strings are not converted
+        """
+        self._delimiters = frozenset(delimiters or ())
+        self._max_length = max_length
 
     def validate(self, value: Any) -> Any:
         if isinstance(value, float):
             return value
 
         if isinstance(value, str):
+            if self._max_length is not None and len(value) > self._max_length:
+                raise TypeConversionError()
             for char in self._delimiters:
                 try:
                     return float(value.replace(char, '.', 1))
@@ -251,8 +542,8 @@ class BoolRule(AbstractRule):
     False  # bool
     """
     def __init__(self, yes: set = None, no: set = None) -> None:
-        self._yes = yes or set()
-        self._no = no or set()
+        self._yes = frozenset(yes or ())
+        self._no = frozenset(no or ())
 
     def validate(self, value: Any) -> Any:
         if isinstance(value, bool):
@@ -278,3 +569,248 @@ class BoolRule(AbstractRule):
                     return False
 
         raise TypeConversionError()
+
+    def validate_batch(self, values: List[Any]) -> Tuple[List[Any], Dict[int, TypeConversionError]]:
+        yes, no = self._yes, self._no
+        results, errors = [], {}
+        for ix, value in enumerate(values):
+            if isinstance(value, bool):
+                results.append(value)
+                continue
+
+            key = value.lower() if isinstance(value, str) else value if isinstance(value, int) else _FAILED
+            if key is not _FAILED and key in yes:
+                results.append(True)
+            elif key is not _FAILED and key in no:
+                results.append(False)
+            else:
+                errors[ix] = TypeConversionError()
+                results.append(value)
+        return results, errors
+
+
+class _FastPath:
+    """
+    Rules of CompositeRule fused for valid values:
+    Min / Max and MinLength / MaxLength into single checks, Enum into a set lookup,
+    rules which pass for every Enum value are dropped, cheap checks first.
+    Any failure returns _FAILED, so errors are built by the original rules
+    """
+    _CONVERTERS = (Number, IntRule, FloatRule, BoolRule)
+    _CHECKS = (Enum, Min, Max, MinLength, MaxLength, Pattern, IsEmail)
+
+    def __init__(self, converters: list, predicates: list, validators: list) -> None:
+        self._converters = converters
+        self._predicates = predicates
+        self._validators = validators
+
+    @classmethod
+    def build(cls, rules: List[AbstractRule]) -> Optional['_FastPath']:
+        """
+        :return: None when rules are not only built-in type checkers and checks
+        """
+        converters, checks = [], []
+        for rule in rules:
+            if type(rule) in cls._CONVERTERS:
+                converters.append(rule.validate)
+            elif type(rule) in cls._CHECKS:
+                checks.append(rule)
+            else:
+                return None
+        if not checks:
+            return None
+
+        enums = [rule for rule in checks if type(rule) is Enum]
+        strict = [_strict_membership(rule._allowed_values) for rule in enums]
+        if len(enums) == 1 and strict[0] is not None:
+            # only the Enum values pass type-strict membership, so rules passed by all of them are not needed
+            checks = [rule for rule in checks if rule is enums[0] or not _passes_all(rule, enums[0]._allowed_values)]
+
+        predicates, validators = [], []
+        for rule, predicate in zip(enums, strict):
+            predicates.append(_membership(rule._allowed_values) if predicate is None else predicate)
+
+        bounds = [rule for rule in checks if type(rule) in (Min, Max)]
+        if bounds:
+            predicates.append(_range_predicate(
+                [(rule._value, rule._include_boundary) for rule in bounds if type(rule) is Min],
+                [(rule._value, rule._include_boundary) for rule in bounds if type(rule) is Max],
+            ))
+
+        lengths = [rule for rule in checks if type(rule) in (MinLength, MaxLength)]
+        if lengths:
+            predicates.append(_length_predicate(
+                max((rule._length for rule in lengths if type(rule) is MinLength), default=None),
+                min((rule._length for rule in lengths if type(rule) is MaxLength), default=None),
+            ))
+
+        validators = [rule.validate for rule in checks if type(rule) in (Pattern, IsEmail)]
+        return cls(converters, predicates, validators)
+
+    def validate(self, value: Any) -> Any:
+        try:
+            for converter in self._converters:
+                value = converter(value)
+            for predicate in self._predicates:
+                if not predicate(value):
+                    return _FAILED
+            for validator in self._validators:
+                validator(value)
+        except Exception:
+            return _FAILED
+        return value
+
+
+def _passes_all(rule: AbstractRule, values: Iterable) -> bool:
+    try:
+        for value in values:
+            rule.validate(value)
+    except Exception:
+        return False
+    return True
+
+
+def _membership(allowed_values: tuple) -> Callable[[Any], bool]:
+    try:
+        allowed = frozenset(allowed_values)
+    except TypeError:  # unhashable values
+        allowed = allowed_values
+    return allowed.__contains__
+
+
+def _strict_membership(allowed_values: tuple) -> Optional[Callable[[Any], bool]]:
+    """
+    Membership by type and value: True and 1.0 are not members of (1, 2).
+    None for unhashable values
+    """
+    try:
+        allowed = frozenset((type(value), value) for value in allowed_values)
+    except TypeError:
+        return None
+    return lambda value: (type(value), value) in allowed
+
+
+def _range_predicate(lows: list, highs: list) -> Callable[[Any], bool]:
+    if len(lows) == 1 and len(highs) == 1 and lows[0][1] and highs[0][1]:
+        low, high = lows[0][0], highs[0][0]
+        return lambda value: not value < low and not value > high
+
+    def predicate(value: Any) -> bool:
+        for low, inclusive in lows:
+            if value < low if inclusive else value <= low:
+                return False
+        for high, inclusive in highs:
+            if value > high if inclusive else value >= high:
+                return False
+        return True
+    return predicate
+
+
+def _length_predicate(min_length: Optional[int], max_length: Optional[int]) -> Callable[[Any], bool]:
+    if min_length is None:
+        return lambda value: not len(value) > max_length
+    if max_length is None:
+        return lambda value: not len(value) < min_length
+    return lambda value: min_length <= len(value) <= max_length
+
+
+class _AdaptiveOrder:
+    """
+    Order of fail_fast rules. Converting rules stay in place, independent checks between them
+    (Enum, Min, Max, MinLength, MaxLength, Pattern, IsEmail) are a segment.
+    Every SAMPLE_RATE-th validation is timed, after REORDER_EVERY samples each segment is sorted
+    by cost / failure rate, so cheap, frequently failing checks run first.
+    A failure is reported as the first failure in declared order: preceding checks
+    of the segment which were not run yet are run on the same value.
+    Other errors of a reordered segment (e.g. TypeError of MaxLength for None) rerun the segment in declared order.
+    Counters are not locked: concurrent updates can be lost, they change only the order of checks
+    """
+    SAMPLE_RATE = 16
+    REORDER_EVERY = 64
+
+    def __init__(self, rules: List[AbstractRule]) -> None:
+        self.rules = rules
+        self._segments = []  # type: List[List[int]]
+        for ix, rule in enumerate(rules):
+            if type(rule) in _FastPath._CHECKS and self._segments and self._is_checks(self._segments[-1]):
+                self._segments[-1].append(ix)
+            else:
+                self._segments.append([ix])
+
+        self._calls = 0
+        self._samples = 0
+        self._runs = [0] * len(rules)
+        self._failures = [0] * len(rules)
+        self._seconds = [0.0] * len(rules)
+
+    def _is_checks(self, segment: List[int]) -> bool:
+        return type(self.rules[segment[0]]) in _FastPath._CHECKS
+
+    def validate(self, value: Any) -> Any:
+        """
+        :raises TypeConversionError:
+        :raises RuleError:
+        """
+        self._calls += 1
+        sample = self._calls % self.SAMPLE_RATE == 0
+        for segment in self._segments:
+            try:
+                value = self._validate_segment(segment, value, sample)
+            except (TypeConversionError, RuleError):
+                raise
+            except Exception:
+                # an earlier check of the declared order can be a type guard of the failed one,
+                # e.g. Pattern before MaxLength for None
+                declared = sorted(segment)
+                if segment == declared:
+                    raise
+                for ix in declared:
+                    value = self.rules[ix].validate(value)
+
+        if sample:
+            self._sampled()
+        return value
+
+    def _validate_segment(self, segment: List[int], value: Any, sample: bool) -> Any:
+        if sample:
+            from time import perf_counter
+
+        for position, ix in enumerate(segment):
+            try:
+                if sample:
+                    start = perf_counter()
+                    try:
+                        value = self.rules[ix].validate(value)
+                    finally:
+                        self._runs[ix] += 1
+                        self._seconds[ix] += perf_counter() - start
+                else:
+                    value = self.rules[ix].validate(value)
+            except (TypeConversionError, RuleError) as error:
+                if sample:
+                    self._failures[ix] += 1
+                    self._sampled()
+                self._raise_declared_first(segment[position + 1:], ix, value, error)
+        return value
+
+    def _raise_declared_first(self, not_run: List[int], failed: int, value: Any, error: RuleError) -> None:
+        for ix in sorted(not_run):
+            if ix > failed:
+                break
+            self.rules[ix].validate(value)
+        raise error
+
+    def _sampled(self) -> None:
+        self._samples += 1
+        if self._samples % self.REORDER_EVERY:
+            return
+
+        def score(ix: int) -> Tuple[float, int]:
+            if not self._failures[ix]:
+                return float('inf'), ix
+            return self._seconds[ix] / self._failures[ix], ix  # cost per run / failure rate
+
+        self._segments = [
+            sorted(segment, key=score) if self._is_checks(segment) else segment
+            for segment in self._segments
+        ]
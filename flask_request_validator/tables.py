@@ -0,0 +1,182 @@
+"""
+Large allow / deny lists in sorted files. The file is memory-mapped on first validation,
+so worker processes share one copy of the pages and values are found by binary search:
+
+    $ python -m flask_request_validator.tables product_ids.txt product_ids.table
+
+    Param('product_id', GET, str, rules=[InTable('product_ids.table')])
+    JsonParam({'domain': [InTable('blocked_domains.table', deny=True)]})
+
+Values are compared as str. A bloom filter of the table answers most lookups of absent values
+without the search. File layout, integers are little-endian uint64:
+
+    header      magic, count, bloom bits, bloom hashes
+    bloom       bloom bits / 8 bytes
+    offsets     count + 1 offsets of values in data
+    data        utf-8 values sorted by bytes, lone surrogates (valid in json) are kept by surrogatepass
+"""
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Iterable, List, Tuple
+
+from .exceptions import ValueTableError, WrongUsageError
+from .rules import AbstractRule
+
+_MAGIC = b'FRVTBL01'
+_HEADER = struct.Struct('<8sQQQ')
+_OFFSET = struct.Struct('<Q')
+DEFAULT_BLOOM_BITS = 10  # per value, ~1% false positives
+
+
+def _bloom_indexes(value: bytes, bits: int, hashes: int) -> Iterable[int]:
+    digest = hashlib.blake2b(value, digest_size=16).digest()
+    h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+    return ((h1 + i * h2) % bits for i in range(hashes))
+
+
+def _encode(value: Any) -> bytes:
+    return str(value).encode('utf-8', 'surrogatepass')
+
+
+def build_table(values: Iterable[Any], path: str, bloom_bits: int = DEFAULT_BLOOM_BITS) -> int:
+    """
+    :param values: str values, other values are converted by str()
+    :param bloom_bits: bits of the bloom filter per value, 0 - no filter
+    :return: count of unique values
+    """
+    encoded = sorted({_encode(value) for value in values})
+    bits = (len(encoded) * bloom_bits + 7) // 8 * 8
+    hashes = max(1, round(bloom_bits * math.log(2))) if bits else 0
+
+    bloom = bytearray(bits // 8)
+    for value in encoded if bits else ():
+        for ix in _bloom_indexes(value, bits, hashes):
+            bloom[ix >> 3] |= 1 << (ix & 7)
+
+    offsets = array('Q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(encoded), bits, hashes))
+        f.write(bloom)
+        f.write(offsets.tobytes())
+        for value in encoded:
+            f.write(value)
+    return len(encoded)
+
+
+class InTable(AbstractRule):
+    """
+    Value is in the table built by build_table, or is not in the table when deny=True.
+    The file is opened on first validation
+    """
+    def __init__(self, path: str, deny: bool = False, bloom: bool = True) -> None:
+        """
+        :param bloom: False - the bloom filter of the table is not used
+        """
+        self._path = path
+        self._deny = deny
+        self._bloom = bloom
+        self._table = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_table'] = None
+        return state
+
+    def _get_table(self) -> '_Table':
+        if self._table is None:
+            self._table = _Table(self._path)
+        return self._table
+
+    def __contains__(self, value: Any) -> bool:
+        return self._get_table().contains(_encode(value), self._bloom)
+
+    def validate(self, value: Any) -> Any:
+        if (value in self) is self._deny:
+            raise ValueTableError(self._path, self._deny)
+        return value
+
+
+class _Table:
+    def __init__(self, path: str) -> None:
+        """
+        :raises WrongUsageError: file is not a table
+        """
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                self._map = b''
+
+        if len(self._map) < _HEADER.size or self._map[:len(_MAGIC)] != _MAGIC:
+            raise WrongUsageError(f'{path} is not a table of flask_request_validator.tables')
+        _, self.count, self.bloom_bits, self.bloom_hashes = _HEADER.unpack_from(self._map)
+
+        self._bloom_start = _HEADER.size
+        self._offsets_start = self._bloom_start + self.bloom_bits // 8
+        self._data_start = self._offsets_start + (self.count + 1) * _OFFSET.size
+
+    def _bounds(self, ix: int) -> Tuple[int, int]:
+        start, = _OFFSET.unpack_from(self._map, self._offsets_start + ix * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._map, self._offsets_start + (ix + 1) * _OFFSET.size)
+        return self._data_start + start, self._data_start + end
+
+    def _in_bloom(self, value: bytes) -> bool:
+        table_map, start = self._map, self._bloom_start
+        for ix in _bloom_indexes(value, self.bloom_bits, self.bloom_hashes):
+            if not table_map[start + (ix >> 3)] & (1 << (ix & 7)):
+                return False
+        return True
+
+    def contains(self, value: bytes, bloom: bool = True) -> bool:
+        if bloom and self.bloom_bits and not self._in_bloom(value):
+            return False
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = self._bounds(middle)
+            item = self._map[start:end]
+            if item == value:
+                return True
+            if item < value:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m flask_request_validator.tables',
+        description='Builds a table of InTable rule from a file with one value per line',
+    )
+    parser.add_argument('path', help='values file, - for stdin')
+    parser.add_argument('output', help='table file')
+    parser.add_argument('--bloom-bits', type=int, default=DEFAULT_BLOOM_BITS,
+                        help=f'bloom filter bits per value, 0 - no filter, default: {DEFAULT_BLOOM_BITS}')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.path == '-' else open(args.path, encoding='utf-8')
+    try:
+        count = build_table((line.rstrip('\r\n') for line in source if line.strip()), args.output, args.bloom_bits)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    sys.stderr.write(f'values: {count}\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Typed results of validate_params(..., typed=True). Classes with __slots__ are generated
+once per endpoint from declared params, so views read attributes instead of dict keys:
+
+    @validate_params(Param('page', GET, int), Param('X-Request-Id', HEADER, str), USER, typed=True)
+    def users(valid: ValidRequest):
+        valid.args.page, valid.headers.X_Request_Id, valid.json.address.city
+
+Names which are not identifiers are converted: 'X-Request-Id' -> X_Request_Id, 'class' -> class_.
+Missing optional values are None. get_params(), get_json(), etc. still return dicts.
+
+JsonParam builds an object of each json object as soon as the object is validated, so there is
+no second walk over the json (values are shared with the dicts of get_json()).
+Only items reused by JsonParam.dedupe are converted from their copies.
+"""
+import keyword
+import re
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import WrongUsageError
+from .nested_json import DiscriminatedJsonParam, JsonParam
+from .validator import FORM, GET, HEADER, JSON, PATH, Param, _ValidRequest
+
+_NOT_IDENTIFIER = re.compile(r'\W')
+_ATTRIBUTES = {GET: 'args', FORM: 'form', PATH: 'path', HEADER: 'headers', JSON: 'json'}
+_CLASSES = {}  # (class name, names) -> generated class. values of other processes are unpickled to the same classes
+
+
+def _attribute_name(name: Any) -> str:
+    attribute = _NOT_IDENTIFIER.sub('_', str(name))
+    if not attribute or attribute[0].isdigit():
+        attribute = '_' + attribute
+    if keyword.iskeyword(attribute):
+        attribute += '_'
+    return attribute
+
+
+def _attribute_names(names: List[Any], owner: str) -> Tuple[str, ...]:
+    """
+    :raises WrongUsageError: two names have the same attribute
+    """
+    attributes = tuple(_attribute_name(name) for name in names)
+    if len(set(attributes)) != len(attributes):
+        raise WrongUsageError(f'{owner}: names {names} have the same attributes {attributes}')
+    return attributes
+
+
+class TypedValues:
+    """
+    Base of generated classes. Attributes are None by default
+    """
+    __slots__ = ()
+    _names = ()  # type: Tuple[Any, ...]  # declared names of __slots__
+
+    def __init__(self) -> None:
+        for attribute in self.__slots__:
+            setattr(self, attribute, None)
+
+    def __reduce__(self) -> tuple:
+        values = tuple(getattr(self, attribute) for attribute in self.__slots__)
+        return _restore, (type(self).__name__, self._names, values)
+
+    def _asdict(self) -> Dict[Any, Any]:
+        return {name: getattr(self, attribute) for name, attribute in zip(self._names, self.__slots__)}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self._asdict() == other._asdict()
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{attribute}={getattr(self, attribute)!r}' for attribute in self.__slots__)
+        return f'{type(self).__name__}({values})'
+
+
+def _make_class(name: str, names: List[Any]) -> type:
+    key = name, tuple(names)
+    cls = _CLASSES.get(key)
+    if cls is None:
+        attributes = _attribute_names(names, name)
+        cls = _CLASSES.setdefault(key, type(name, (TypedValues, ), {'__slots__': attributes, '_names': key[1]}))
+    return cls
+
+
+def _restore(name: str, names: Tuple[Any, ...], values: tuple) -> TypedValues:
+    """
+    Unpickled value of a generated class
+    """
+    obj = _make_class(name, list(names))()
+    for attribute, value in zip(obj.__slots__, values):
+        setattr(obj, attribute, value)
+    return obj
+
+
+class _JsonType:
+    """
+    Generated class of a json node
+    """
+    def __init__(self, param: JsonParam, name: str, types: Dict[JsonParam, '_JsonType']) -> None:
+        """
+        :param types: filled with types of object schemas
+        """
+        self.as_list = param.as_list
+        self.cls = None  # type: Optional[type]
+        self.fields = ()  # type: Tuple[Tuple[Any, str, Optional[_JsonType]], ...]
+        self.variants = None  # type: Optional[Dict[Any, _JsonType]]
+        self.key = None
+
+        if isinstance(param, DiscriminatedJsonParam):
+            self.key = param.key
+            self.variants = {
+                value: _JsonType(schema, name + _attribute_name(value).title(), types)
+                for value, schema in param.schemas.items()
+            }
+        elif isinstance(param.rules_map, MappingProxyType):
+            self.cls = _make_class(name, list(param.rules_map))
+            fields = []
+            for (key, rules), attribute in zip(param.rules_map.items(), self.cls.__slots__):
+                child = _JsonType(rules, name + attribute.title(), types) if isinstance(rules, JsonParam) else None
+                fields.append((key, attribute, child))
+            self.fields = tuple(fields)
+            types.setdefault(param, self)  # a schema used by several keys (e.g. interned) has one class
+
+    def convert(self, value: Any) -> Any:
+        if value is None:
+            return None
+        if self.as_list and isinstance(value, list):
+            return [self._convert_object(item) for item in value]
+        return self._convert_object(value)
+
+    def _convert_object(self, value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        if self.variants is not None:
+            variant = self.variants.get(value.get(self.key))
+            return value if variant is None else variant._convert_object(value)
+        if self.cls is None:
+            return value
+
+        obj = self.cls()
+        for key, attribute, child in self.fields:
+            if key in value:
+                item = value[key]
+                setattr(obj, attribute, item if child is None else child.convert(item))
+        return obj
+
+
+class _JsonBuilder:
+    """
+    Objects of a request built by JsonParam.validate: children are validated before parents,
+    so objects of child dicts are found by identity of the dicts
+    """
+    def __init__(self, types: Dict[JsonParam, _JsonType]) -> None:
+        self._types = types
+        self._objects = {}  # id of a valid dict -> (dict, object). dicts are kept, so ids are not reused
+
+    def add(self, schema: JsonParam, value: Any) -> None:
+        json_type = self._types.get(schema)
+        if json_type is None or not isinstance(value, dict):
+            return
+
+        obj = json_type.cls()
+        for key, attribute, child in json_type.fields:
+            if key in value:
+                item = value[key]
+                setattr(obj, attribute, item if child is None else self.result(item))
+        self._objects[id(value)] = value, obj
+
+    def convert(self, schema: JsonParam, value: Any) -> None:
+        """
+        Object of a valid copy, see: JsonParam.dedupe
+        """
+        json_type = self._types.get(schema)
+        if json_type is not None and isinstance(value, dict):
+            self._objects[id(value)] = value, json_type._convert_object(value)
+
+    def result(self, value: Any) -> Any:
+        if type(value) is list:
+            return [self._object(item) for item in value]
+        return self._object(value)
+
+    def _object(self, value: Any) -> Any:
+        item = self._objects.get(id(value))
+        return value if item is None or item[0] is not value else item[1]
+
+
+class TypedPlan:
+    """
+    Generated classes of an endpoint
+    """
+    def __init__(self, params: tuple) -> None:
+        """
+        :raises WrongUsageError:
+        """
+        self._params = params
+        names = {param_type: [] for param_type in _ATTRIBUTES}
+        self.json = None  # type: Optional[_JsonType]
+        self.json_types = {}  # type: Dict[JsonParam, _JsonType]
+        for param in params:
+            if isinstance(param, Param) and param.param_type in names:
+                names[param.param_type].append(param.name)
+            elif isinstance(param, JsonParam):
+                self.json = _JsonType(param, 'Json', self.json_types)
+
+        self.classes = {
+            param_type: _make_class(_ATTRIBUTES[param_type].title(), type_names)
+            for param_type, type_names in names.items()
+        }
+        self.attributes = {
+            param_type: dict(zip(cls._names, cls.__slots__))
+            for param_type, cls in self.classes.items()
+        }
+
+    def __reduce__(self) -> tuple:
+        return TypedPlan, (self._params, )
+
+    def __deepcopy__(self, memo: dict) -> 'TypedPlan':
+        return self  # not changed after creation, shared by copies of results
+
+    def new_request(self, source: Any) -> '_TypedValidRequest':
+        return _TypedValidRequest(self, source)
+
+
+class _TypedValidRequest(_ValidRequest):
+    def __init__(self, plan: TypedPlan, source: Any = None) -> None:
+        super().__init__(source)
+        self._plan = plan
+        self._values = {param_type: cls() for param_type, cls in plan.classes.items()}
+        self._dicts = {}  # param type -> dict of get_params(), etc.
+        self._builder = None
+        self.args = self._values[GET]
+        self.form = self._values[FORM]
+        self.path = self._values[PATH]
+        self.headers = self._values[HEADER]
+        self.json = None if plan.json else self._values[JSON]  # JsonParam or JSON Params
+
+    def set_value(self, param_type: str, key: str, value: Any):
+        setattr(self._values[param_type], self._plan.attributes[param_type][key], value)
+        self._dicts.pop(param_type, None)
+        if param_type == JSON:
+            super().set_value(param_type, key, value)
+
+    def json_builder(self) -> Optional[_JsonBuilder]:
+        if self._plan.json is not None:
+            self._builder = _JsonBuilder(self._plan.json_types)
+        return self._builder
+
+    def set_json(self, value: dict):
+        super().set_json(value)
+        if self._plan.json is None:
+            self.json = value
+        elif self._builder is None:
+            self.json = self._plan.json.convert(value)
+        else:
+            self.json, self._builder = self._builder.result(value), None
+
+    def _dict(self, param_type: str) -> Dict[str, Any]:
+        result = self._dicts.get(param_type)
+        if result is None:
+            values = self._values[param_type]._asdict().items()
+            result = self._dicts[param_type] = {key: value for key, value in values if value is not None}
+        return result
+
+    def get_form(self) -> Dict[str, Any]:
+        return self._dict(FORM)
+
+    def get_headers(self) -> Dict[str, Any]:
+        return self._dict(HEADER)
+
+    def get_params(self) -> Dict[str, Any]:
+        return self._dict(GET)
+
+    def get_path_params(self) -> Dict[str, Any]:
+        return self._dict(PATH)
+
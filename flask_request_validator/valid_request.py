@@ -1,7 +1,8 @@
 from abc import abstractmethod, ABC
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 
-from flask import Request
+if TYPE_CHECKING:
+    from flask import Request
 
 
 class ValidRequest(ABC):
@@ -25,6 +26,12 @@ class ValidRequest(ABC):
     def get_path_params(self) -> Dict[str, Any]:
         pass
 
+    def get_ndjson(self) -> Any:
+        """
+        Iterator of valid NDJSON records, see: NdJsonParam. None when the endpoint has no NdJsonParam
+        """
+        return None
+
     @abstractmethod
-    def get_flask_request(self) -> Request:
+    def get_flask_request(self) -> 'Request':
         pass
@@ -1,16 +1,20 @@
 import types
 from copy import deepcopy
 from functools import wraps
-from typing import Tuple
-
-from flask import request, Request
+from typing import Tuple, TYPE_CHECKING
 
 from .after_param import AbstractAfterParam
+from .bodies import load_body
 from .exceptions import *
-from .rules import CompositeRule
+from .rules import CompositeRule, _Frozen
 from .valid_request import ValidRequest
 from .nested_json import JsonParam
-from .files import File, FileChain
+from .files import File, FileChain, FileStreamLimits
+from .ndjson import NdJsonParam, NdJsonRecords
+from .limits import RequestLimits
+
+if TYPE_CHECKING:
+    from flask import Request
 
 
 GET = 'GET'
@@ -19,13 +23,28 @@ FORM = 'FORM'
 HEADER = 'HEADER'
 JSON = 'JSON'
 FILES = ' FILES'
+NDJSON = 'NDJSON'
 PARAM_TYPES = (GET, PATH, FORM, JSON, HEADER)
 _ALLOWED_TYPES = (str, bool, int, float, dict, list)
+_MULTI_PARAM_TYPES = (GET, FORM)
+_URL_PARAM_TYPES = (PATH, GET)
+# (plan, valid, deferred params) of a request validated by ValidationMiddleware, see: _finish
+VALID_ENVIRON_KEY = 'flask_request_validator.valid'
+_PLAN_ATTRIBUTE = '_frv_plan'
+
+
+def _flask_request() -> 'Request':
+    """
+    flask is imported on first validation, not on import of schemas
+    """
+    from flask import request
+    return request
 
 
 class _ValidRequest(ValidRequest):
-    def __init__(self) -> None:
+    def __init__(self, source: Any = None) -> None:
         self._valid_data = dict()
+        self._source = source
 
     def set_value(self, param_type: str, key: str, value: Any):
         self._valid_data.setdefault(param_type, dict())
@@ -34,6 +53,15 @@ class _ValidRequest(ValidRequest):
     def set_json(self, value: dict):
         self._valid_data[JSON] = value
 
+    def json_builder(self) -> Any:
+        """
+        Receiver of objects validated by JsonParam, see: typed.py
+        """
+        return None
+
+    def set_ndjson(self, records: NdJsonRecords):
+        self._valid_data[NDJSON] = records
+
     def get_form(self) -> Dict[str, Any]:
         return self._valid_data.get(FORM, dict())
 
@@ -49,13 +77,19 @@ class _ValidRequest(ValidRequest):
     def get_path_params(self) -> Dict[str, Any]:
         return self._valid_data.get(PATH, dict())
 
-    def get_flask_request(self) -> Request:
-        return request
+    def get_ndjson(self) -> NdJsonRecords:
+        return self._valid_data.get(NDJSON)
+
+    def get_flask_request(self) -> 'Request':
+        """
+        flask.request or data source of validate_request
+        """
+        return _flask_request() if self._source is None else self._source
 
 
-class Param:
+class Param(_Frozen):
     def __init__(self, name, param_type, value_type=None,
-                 required=True, default=None, rules=None):
+                 required=True, default=None, rules=None, multi=False, max_length=None):
         """
         :param mixed default:
         :param bool required:
@@ -63,6 +97,9 @@ class Param:
         :param list|CompositeRule rules:
         :param str name: name of param
         :param str param_type: type of request param (see: PARAM_TYPES)
+        :param bool multi: list or dict from repeated keys as is: ?tag=a,b&tag=c -> ['a,b', 'c'].
+                           By default each value is split by comma: ['a', 'b', 'c']
+        :param int max_length: longer raw values (each of repeated values) are invalid and are not converted
         :raises:
             WrongUsageError
         """
@@ -78,7 +115,13 @@ class Param:
             raise WrongUsageError(
                 'Param.name = "%s". '
                 'defaults are only allowed when required=False' % (name, ))
+        if multi and (param_type not in _MULTI_PARAM_TYPES or value_type not in (list, dict)):
+            raise WrongUsageError(
+                'Param.name = "%s". '
+                'multi is only allowed for list or dict values of %s' % (name, _MULTI_PARAM_TYPES))
 
+        self.multi = multi
+        self.max_length = max_length
         self.value_type = value_type
         self.default = default
         self.required = required
@@ -88,12 +131,17 @@ class Param:
             self.rules = rules
         else:
             self.rules = CompositeRule(*rules or [])
+        self._freeze()
 
     def value_to_type(self, value: Any) -> Any:
         """
         :raises:
             TypeConversionError:
+            RulesError: value is longer than max_length
         """
+        if self.max_length is not None:
+            self._check_length(value)
+
         if self.value_type == bool:
             if isinstance(value, str):
                 low_val = value.lower()
@@ -103,15 +151,12 @@ class Param:
                 elif low_val in ('false', '0'):
                     value = False
         elif self.value_type == list:
-            value = [item.strip() for item in value.split(',')]
-        elif self.value_type == dict:
-            value = {
-                item.split(':')[0].strip(): item.partition(':')[-1].strip()
-                for item in value.split(',')
-            }
+            value = self._to_items(value)
+        elif self.value_type == dict and not isinstance(value, dict):
+            value = dict(self._to_pair(item) for item in self._to_items(value))
 
         try:
-            if self.value_type:
+            if self.value_type and type(value) is not self.value_type:
                 value = self.value_type(value)
         except (ValueError, TypeError):
             raise TypeConversionError()
@@ -120,21 +165,56 @@ class Param:
             raise TypeConversionError()
         return value
 
-    def get_value_from_request(self) -> Any:
+    def _check_length(self, value: Any) -> None:
+        values = value if isinstance(value, list) else (value, )
+        for item in values:
+            if isinstance(item, str) and len(item) > self.max_length:
+                raise RulesError(ValueMaxLengthError(self.max_length))
+
+    def _to_items(self, value: Union[str, list]) -> list:
+        """
+        'a, b' -> ['a', 'b']. Lists of repeated GET, FORM values are flattened: ['a, b', 'c'] -> ['a', 'b', 'c']
+        """
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',')]
+        if self.multi or self.param_type not in _MULTI_PARAM_TYPES:
+            return value
+
+        items = []
+        for raw in value:
+            items.extend(item.strip() for item in raw.split(','))
+        return items
+
+    @staticmethod
+    def _to_pair(item: Any) -> Tuple[str, str]:
+        key, _, value = str(item).partition(':')
+        return key.strip(), value.strip()
+
+    def get_value_from_request(self, source: Any = None) -> Any:
         """
+        :param source: flask.request by default. see: validate_request
         :raises:
             RequiredValueError:
         """
         value = None
+        request = _flask_request() if source is None else source
         if self.param_type == FORM:
-            value = request.form.get(self.name)
+            if self.multi:
+                value = request.form.getlist(self.name) or None
+            else:
+                value = request.form.get(self.name)
         elif self.param_type == GET:
-            value = request.args.getlist(self.name)
-            value = ",".join(value) if value else None
+            values = request.args.getlist(self.name)
+            if not values:
+                value = None
+            elif self.value_type in (list, dict):
+                value = values
+            else:
+                value = values[0] if len(values) == 1 else ','.join(values)
         elif self.param_type == PATH:
             value = request.view_args.get(self.name)
         elif self.param_type == JSON:
-            json_ = request.get_json()
+            json_ = load_body(request)
             value = json_.get(self.name) if json_ else None
         elif self.param_type == HEADER:
             value = request.headers.get(self.name)
@@ -144,72 +224,236 @@ class Param:
         return value
 
 
-def validate_params(*params: Union[JsonParam, Param, AbstractAfterParam, File, FileChain]):
+def validate_params(
+    *params: Union[JsonParam, Param, AbstractAfterParam, File, FileChain, NdJsonParam, RequestLimits],
+    typed: bool = False,
+    cache: Any = None,
+):
     """
+    :param typed: ValidRequest has attributes args, form, path, headers, json
+                  with instances of generated classes, see: typed.py
+    :param cache: backend of results of identical requests, e.g. LRUCache. see: cache.py
     :raises:
         InvalidHeadersError: When found invalid headers. Raises before other params validation
-        InvalidRequestError: Raises after headers validation if errors found
+        InvalidRequestError: Raises after headers validation if errors found.
+            Errors of PATH and GET params are raised before the body is read.
+            Malformed msgpack / cbor body is reported as InvalidJsonError in json errors
+        RequestLimitError: When body exceeds RequestLimits. Raises before body validation
         WrongUsageError:
     """
-    files = [isinstance(f, File) for f in params]
-    chains = [isinstance(f, FileChain) for f in params]
-    if any(files) and any(chains):
-        raise WrongUsageError('it is impossible to use File and FileChain. You should use FileChain or multiple File')
+    plan = _ValidationPlan(params, typed)
+
+    def decorator(func):
+        cached = None
+        if cache is not None:
+            from .cache import CachedPlan
+            cached = CachedPlan(plan, cache, f'{func.__module__}.{func.__qualname__}')
 
-    def validate_request(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            header_params, other_params, after_params = (), (), ()
-            for param in params:
-                if isinstance(param, Param) and param.param_type == HEADER:
-                    header_params += (param, )
-                elif isinstance(param, AbstractAfterParam):
-                    after_params += (param, )
-                else:
-                    other_params += (param, )
-
-            valid = _ValidRequest()
-            valid, errors = __get_request_errors(header_params, valid)
-            if errors.get(HEADER):
-                raise InvalidHeadersError(errors[HEADER])
-
-            valid, errors = __get_request_errors(other_params, valid)
-            for type_errors in errors.values():
-                if type_errors:
-                    raise InvalidRequestError(errors[GET], errors[FORM],
-                                              errors[PATH], errors[JSON], errors[FILES])
-            for param in after_params:
-                param.validate(valid)
-
+            request = _flask_request()
+            validated = request.environ.get(VALID_ENVIRON_KEY)
+            if validated is not None and validated[0] is plan:
+                _, valid, deferred = validated
+                valid._source = None
+                valid = _finish(plan, valid, deferred)
+            elif cached is None:
+                valid = _validate(plan, request)
+            else:
+                valid = cached.validate(request)
             args += (valid, )
             return func(*args, **kwargs)
+
+        setattr(wrapper, _PLAN_ATTRIBUTE, plan)
         return wrapper
-    return validate_request
+    return decorator
+
+
+def validation_plan(
+    params: Iterable[Union[JsonParam, Param, AbstractAfterParam, File, FileChain, NdJsonParam, RequestLimits]],
+    typed: bool = False,
+) -> '_ValidationPlan':
+    """
+    Params grouped once for repeated validate_request calls, so generated typed classes are shared too:
+
+        plan = validation_plan(params)
+        for message in messages:
+            valid = validate_request(plan, RequestData(json=message))
+
+    :raises WrongUsageError:
+    """
+    return _ValidationPlan(tuple(params), typed)
+
+
+def validate_request(
+    params: Union[
+        Iterable[Union[JsonParam, Param, AbstractAfterParam, File, FileChain, NdJsonParam, RequestLimits]],
+        '_ValidationPlan',
+    ],
+    source: Any = None,
+    typed: bool = False,
+) -> ValidRequest:
+    """
+    Validation without the decorator. source is flask.request by default or any object
+    with the same interface, e.g. RequestData built from plain mappings:
 
+        valid = validate_request(params, RequestData(args={'page': '2'}, json=message))
 
-def __get_request_errors(
+    :param params: params or a plan of validation_plan. Params are grouped on each call
+    :param typed: params only, typed plans are built by validation_plan(params, typed=True)
+    :raises:
+        InvalidHeadersError:
+        InvalidRequestError:
+        RequestLimitError:
+        WrongUsageError:
+    """
+    if isinstance(params, _ValidationPlan):
+        if typed and params.typed is None:
+            raise WrongUsageError('typed plans are built by validation_plan(params, typed=True)')
+        plan = params
+    else:
+        plan = _ValidationPlan(tuple(params), typed)
+    return _validate(plan, _flask_request() if source is None else source)
+
+
+class _ValidationPlan:
+    """
+    Params of an endpoint grouped once, when the endpoint is decorated.
+    Stages are ordered by cost: headers, url (PATH, GET), body (FORM, JSON, files).
+    Body is not read when headers or url params are invalid
+    """
+    def __init__(self, params: tuple, typed: bool = False) -> None:
+        """
+        :raises WrongUsageError:
+        """
+        files = [f for f in params if isinstance(f, (File, FileChain))]
+        if any(isinstance(f, File) for f in files) and any(isinstance(f, FileChain) for f in files):
+            raise WrongUsageError('it is impossible to use File and FileChain. '
+                                  'You should use FileChain or multiple File')
+
+        limits = [p for p in params if isinstance(p, RequestLimits)]
+        if len(limits) > 1:
+            raise WrongUsageError('it is impossible to use multiple RequestLimits')
+        self.limits = limits[0] if limits else None
+
+        self.header_params, self.url_params, self.body_params, self.after_params = (), (), (), ()
+        self.has_json = False
+        for param in params:
+            if isinstance(param, RequestLimits):
+                continue
+            if isinstance(param, JsonParam) or isinstance(param, Param) and param.param_type == JSON:
+                self.has_json = True
+
+            if isinstance(param, Param) and param.param_type == HEADER:
+                self.header_params += (param, )
+            elif isinstance(param, Param) and param.param_type in _URL_PARAM_TYPES:
+                self.url_params += (param, )
+            elif isinstance(param, AbstractAfterParam):
+                self.after_params += (param, )
+            else:
+                self.body_params += (param, )
+
+        self.file_limits = FileStreamLimits(files) if files else None
+        self.typed = None
+        if typed:
+            from .typed import TypedPlan
+            self.typed = TypedPlan(params)
+
+    def new_request(self, source: Any) -> _ValidRequest:
+        return _ValidRequest(source) if self.typed is None else self.typed.new_request(source)
+
+
+def _validate(plan: _ValidationPlan, source: Any, deferred: List[Param] = None) -> _ValidRequest:
+    """
+    :param deferred: ValidationMiddleware validates outside of the app context: Params with callable defaults
+                     are collected into deferred, after params are not run. see: _finish
+    """
+    valid = plan.new_request(source)
+    valid, errors = _get_request_errors(plan.header_params, valid, source, deferred)
+    if errors.get(HEADER):
+        raise InvalidHeadersError(errors[HEADER])
+
+    valid, errors = _get_request_errors(plan.url_params, valid, source, deferred)
+    _raise_request_errors(errors)
+
+    if plan.limits is not None:
+        plan.limits.check_size(source)
+
+    if plan.file_limits is not None:
+        try:
+            plan.file_limits.parse(source)
+        except FileError as error:
+            raise InvalidRequestError({}, {}, {}, {}, [error])
+
+    if plan.has_json:
+        try:
+            body = load_body(source)
+        except InvalidJsonError as error:
+            raise InvalidRequestError({}, {}, {}, [error], [])
+        if plan.limits is not None:
+            plan.limits.check_json(body)
+
+    valid, errors = _get_request_errors(plan.body_params, valid, source, deferred)
+    _raise_request_errors(errors)
+    if deferred is None:
+        for param in plan.after_params:
+            param.validate(valid)
+    return valid
+
+
+def _finish(plan: _ValidationPlan, valid: _ValidRequest, deferred: List[Param]) -> _ValidRequest:
+    """
+    Callable defaults and after params of a request validated by ValidationMiddleware, run by the view
+    """
+    for param in deferred:
+        valid.set_value(param.param_type, param.name, param.default())
+    for param in plan.after_params:
+        param.validate(valid)
+    return valid
+
+
+def _raise_request_errors(errors: dict) -> None:
+    """
+    :raises InvalidRequestError:
+    """
+    for type_errors in errors.values():
+        if type_errors:
+            raise InvalidRequestError(errors[GET], errors[FORM],
+                                      errors[PATH], errors[JSON], errors[FILES])
+
+
+def _get_request_errors(
     params: Tuple[Union[Param, JsonParam], ...],
-    valid: _ValidRequest
+    valid: _ValidRequest,
+    source: Any,
+    deferred: List[Param] = None,
 ) -> Tuple[_ValidRequest, Dict[str, Union[Dict[str, RulesError], List[JsonError], List[FileError]]]]:
     errors = {GET: dict(), FORM: dict(), JSON: dict(), HEADER: dict(), PATH: dict(), FILES: []}
     for param in params:
         if isinstance(param, JsonParam):
-            value, json_errors = param.validate(deepcopy(request.get_json()))
+            value, json_errors = param.validate(deepcopy(load_body(source)), builder=valid.json_builder())
             if json_errors:
                 errors[JSON] = json_errors
             else:
                 valid.set_json(value)
             continue
 
+        if isinstance(param, NdJsonParam):
+            try:
+                valid.set_ndjson(param.validate(source))
+            except InvalidJsonError as error:
+                errors[JSON] = [error]
+            continue
+
         if isinstance(param, (File, FileChain)):
             try:
-                param.validate(request.files)
+                param.validate(source.files)
             except FileError as error:
                 errors[FILES].append(error)
             continue
 
         try:
-            value = param.get_value_from_request()
+            value = param.get_value_from_request(source)
             if value is not None:
                 value = param.value_to_type(value)
                 value = param.rules.validate(value)
@@ -218,7 +462,10 @@ def __get_request_errors(
 
             if param.default is not None:
                 if isinstance(param.default, types.LambdaType):
-                    valid.set_value(param.param_type, param.name, param.default())
+                    if deferred is None:
+                        valid.set_value(param.param_type, param.name, param.default())
+                    else:
+                        deferred.append(param)
                 else:
                     valid.set_value(param.param_type, param.name, param.default)
         except (RequiredValueError, TypeConversionError, RulesError) as error:
@@ -20,6 +20,17 @@ setup(
     keywords='flask request validation',
     packages=['flask_request_validator'],
     install_requires=['flask'],
+    extras_require={
+        'msgpack': ['msgpack'],
+        'cbor': ['cbor2'],
+        're2': ['google-re2'],
+    },
+    entry_points={
+        'console_scripts': [
+            'frv-ndjson=flask_request_validator.ndjson:main',
+            'frv-table=flask_request_validator.tables:main',
+        ],
+    },
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Framework :: Flask',
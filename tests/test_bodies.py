@@ -0,0 +1,84 @@
+import importlib.util
+import json
+from unittest import TestCase, skipUnless
+
+import flask
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.bodies import load_body
+
+_HAS_MSGPACK = importlib.util.find_spec('msgpack') is not None
+_HAS_CBOR = importlib.util.find_spec('cbor2') is not None
+
+_app = flask.Flask(__name__)
+
+
+@_app.errorhandler(RequestError)
+def handler(e):
+    return str(e.to_dict() if isinstance(e, InvalidRequestError) else e), 400
+
+
+@_app.route('/users', methods=['POST'])
+@validate_params(
+    Param('page', JSON, int, required=False, default=1),
+    JsonParam({'name': [MinLength(2)], 'age': [IntRule()]}),
+)
+def users(valid: ValidRequest):
+    return flask.jsonify(valid.get_json())
+
+
+def _encode(mimetype: str, value) -> bytes:
+    if mimetype == 'application/json':
+        return json.dumps(value).encode()
+    if mimetype == 'application/cbor':
+        import cbor2
+        return cbor2.dumps(value)
+    import msgpack
+    return msgpack.packb(value)
+
+
+_MIME_TYPES = [
+    ('application/json', ),
+    *([('application/msgpack', ), ('application/x-msgpack', )] if _HAS_MSGPACK else []),
+    *([('application/cbor', )] if _HAS_CBOR else []),
+]
+
+
+class TestBodies(TestCase):
+    @parameterized.expand(_MIME_TYPES)
+    def test_bodies(self, mimetype):
+        with _app.test_client() as client:
+            response = client.post(
+                '/users',
+                data=_encode(mimetype, {'name': 'Bob', 'age': '27', 'page': 2}),
+                content_type=mimetype,
+            )
+            self.assertEqual({'name': 'Bob', 'age': 27, 'page': 2}, response.json)
+
+            response = client.post('/users', data=_encode(mimetype, {'name': 'B', 'age': 1}), content_type=mimetype)
+            self.assertEqual(
+                b"{'json': [JsonError(['root'], {'name': RulesError(ValueMinLengthError(2))}, False)]}",
+                response.data,
+            )
+
+    @skipUnless(_HAS_MSGPACK, 'msgpack is not installed')
+    def test_invalid_body(self):
+        with _app.test_client() as client:
+            response = client.post('/users', data=b'\xc1', content_type='application/msgpack')
+            self.assertEqual(400, response.status_code)
+            self.assertTrue(response.data.startswith(b"{'json': [InvalidJsonError('invalid application/msgpack body"))
+
+        params = [JsonParam({'name': [MinLength(2)]})]
+        with self.assertRaises(InvalidRequestError) as e:
+            validate_request(params, RequestData(data=b'\xc1', mimetype='application/msgpack'))
+        self.assertIsInstance(e.exception.json[0], InvalidJsonError)
+
+    @skipUnless(_HAS_MSGPACK, 'msgpack is not installed')
+    def test_request_data(self):
+        import msgpack
+
+        source = RequestData(data=msgpack.packb({'name': 'Bob'}), mimetype='application/msgpack')
+        self.assertEqual({'name': 'Bob'}, load_body(source))
+        self.assertIs(load_body(source), load_body(source))
+        self.assertEqual({'name': 'Bob'}, load_body(RequestData(json={'name': 'Bob'})))
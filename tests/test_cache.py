@@ -0,0 +1,169 @@
+import pickle
+from unittest import TestCase, mock
+
+import flask
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.cache import CachedPlan, LRUCache
+from flask_request_validator.validator import _ValidationPlan
+
+
+class _CountingRule(AbstractRule):
+    calls = 0
+
+    def validate(self, value):
+        _CountingRule.calls += 1
+        return value
+
+
+class _PickleBackend:
+    """
+    Backend of worker processes
+    """
+    def __init__(self):
+        self.items = {}
+
+    def get(self, key):
+        value = self.items.get(key)
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key, value):
+        self.items[key] = pickle.dumps(value)
+
+
+class _After(AbstractAfterParam):
+    def validate(self, value: ValidRequest):
+        pass
+
+
+_cache = LRUCache(max_size=8)
+_app = flask.Flask(__name__)
+_app.testing = True
+
+
+@_app.errorhandler(RequestError)
+def handler(e):
+    return type(e).__name__, 400
+
+
+@_app.route('/users/<int:user_id>', methods=['GET', 'POST'])
+@validate_params(
+    Param('user_id', PATH, int),
+    Param('page', GET, int, required=False, rules=[_CountingRule()]),
+    Param('X-Tenant', HEADER, str, required=False),
+    JsonParam({'name': [MinLength(2), _CountingRule()]}, required=False),
+    cache=_cache,
+    typed=True,
+)
+def user(valid: ValidRequest, user_id: int):
+    valid.json.name += '!'  # views get copies of cached results
+    return flask.jsonify(page=valid.args.page, tenant=valid.headers.X_Tenant, name=valid.json.name)
+
+
+class TestCache(TestCase):
+    def test_endpoint(self):
+        _CountingRule.calls = 0
+        with _app.test_client() as client:
+            for _ in range(3):
+                response = client.post('/users/1?page=2', json={'name': 'Bob'}, headers={'X-Tenant': 'a'})
+                self.assertEqual({'page': 2, 'tenant': 'a', 'name': 'Bob!'}, response.json)
+            self.assertEqual(2, _CountingRule.calls)
+
+            for path, body, tenant in (('/users/2?page=2', 'Bob', 'a'), ('/users/1?page=2', 'Ann', 'a'),
+                                       ('/users/1?page=2', 'Bob', 'b'), ('/users/1?page=3', 'Bob', 'a')):
+                response = client.post(path, json={'name': body}, headers={'X-Tenant': tenant})
+                self.assertEqual(200, response.status_code)
+            self.assertEqual(2 + 8, _CountingRule.calls)
+
+            for _ in range(2):
+                response = client.post('/users/1', json={'name': 'B'})
+                self.assertEqual((400, b'InvalidRequestError'), (response.status_code, response.data))
+            self.assertEqual(2 + 8 + 1, _CountingRule.calls)
+
+    def test_lru(self):
+        cache = LRUCache(max_size=2)
+        cache.set(b'a', 1)
+        cache.set(b'b', 2)
+        self.assertEqual(1, cache.get(b'a'))
+        cache.set(b'c', 3)
+        self.assertEqual((1, None, 3), (cache.get(b'a'), cache.get(b'b'), cache.get(b'c')))
+
+        cache = LRUCache(ttl=10)
+        with mock.patch('flask_request_validator.cache.monotonic', return_value=100):
+            cache.set(b'a', 1)
+        with mock.patch('flask_request_validator.cache.monotonic', return_value=109):
+            self.assertEqual(1, cache.get(b'a'))
+        with mock.patch('flask_request_validator.cache.monotonic', return_value=110):
+            self.assertIsNone(cache.get(b'a'))
+        self.assertEqual(0, len(cache))
+
+    @parameterized.expand([
+        (_After(), ),
+        (Param('page', GET, int, required=False, default=lambda: 1), ),
+        (File('avatar', ['image/png'], 1024), ),
+        (NdJsonParam(JsonParam({'id': [IntRule()]})), ),
+    ])
+    def test_not_pure(self, param):
+        with self.assertRaises(WrongUsageError):
+            validate_params(param, cache=LRUCache())(lambda valid: None)
+
+    def test_errors(self):
+        cache = LRUCache()
+        plan = CachedPlan(_ValidationPlan((JsonParam({'name': [MinLength(2)]}), )), cache, 'users')
+        errors = []
+        for _ in range(3):
+            with _app.test_request_context(method='POST', json={'name': 'B'}):
+                with self.assertRaises(InvalidRequestError) as e:
+                    plan.validate(flask.request)
+                errors.append(e.exception)
+
+        (_, stored), = cache._items.values()
+        self.assertIsNone(stored.__traceback__)
+        self.assertEqual(4, len({id(error) for error in errors + [stored]}))
+        self.assertEqual([repr(errors[0].to_dict())] * 3, [repr(error.to_dict()) for error in errors])
+
+    def test_nested_errors_without_tracebacks(self):
+        cache = LRUCache()
+        plan = CachedPlan(_ValidationPlan((
+            Param('page', GET, int, rules=[Min(5)]),
+            JsonParam({'users': JsonParam({'name': [MinLength(2)]}, as_list=True)}),
+        )), cache, 'users')
+        for query, name in (('page=1', 'Bob'), ('page=5', 'B')):
+            with _app.test_request_context(f'/?{query}', method='POST', json={'users': [{'name': name}]}):
+                with self.assertRaises(InvalidRequestError) as e:
+                    plan.validate(flask.request)
+        self.assertIsNotNone(e.exception.json[0].__traceback__)
+
+        def walk(value):
+            if isinstance(value, BaseException):
+                yield value
+                value = list(value.__dict__.values())
+            if isinstance(value, dict):
+                value = list(value.values())
+            if isinstance(value, (list, tuple)):
+                for item in value:
+                    yield from walk(item)
+
+        nested = [error for _, stored in cache._items.values() for error in walk(stored)]
+        self.assertGreater(len(nested), 6)
+        for error in nested:
+            self.assertEqual((None, None, None), (error.__traceback__, error.__context__, error.__cause__))
+
+    def test_pickle_backend(self):
+        params = (
+            Param('page', GET, int),
+            JsonParam({'user': JsonParam({'name': [MinLength(2)]}), 'tags': JsonParam([MinLength(1)], as_list=True)}),
+        )
+        plan = CachedPlan(_ValidationPlan(params, typed=True), _PickleBackend(), 'users')
+        results = []
+        for _ in range(2):
+            with _app.test_request_context('/?page=2', method='POST', json={'user': {'name': 'Bob'}, 'tags': ['a']}):
+                results.append(plan.validate(flask.request))
+
+        first, cached = results
+        self.assertEqual(1, len(plan.backend.items))
+        self.assertEqual((2, 'Bob', ['a']), (cached.args.page, cached.json.user.name, cached.json.tags))
+        self.assertIs(type(first.json.user), type(cached.json.user))
+        self.assertEqual(first.json, cached.json)
+        self.assertEqual({'page': 2}, cached.get_params())
@@ -0,0 +1,109 @@
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from flask_request_validator import JsonParam, Enum, MinLength, IsEmail
+from flask_request_validator.error_formatter import demo_error_formatter, error_formatter
+from flask_request_validator.exceptions import *
+
+
+_SCHEMA = JsonParam({
+    'name': [MinLength(2)],
+    'a/b': [Enum('c')],
+    'users': JsonParam({'email': [IsEmail()]}, as_list=True),
+    'tags': JsonParam([MinLength(2)], as_list=True),
+    'groups': JsonParam({'address': JsonParam({'city': [MinLength(3)]})}, as_list=True, required=False),
+})
+
+
+class TestErrorFormatter(TestCase):
+    @parameterized.expand([
+        (
+            InvalidHeadersError({'Authorization': RulesError(ValueEnumError(('Bearer token',)))}),
+            [{'path': '/header/Authorization', 'code': 'ValueEnumError',
+              'message': 'not allowed, allowed values: Bearer token'}],
+        ),
+        (
+            InvalidHeadersError({'X-Version': RulesError(ValueEnumError((1, 2)))}),
+            [{'path': '/header/X-Version', 'code': 'ValueEnumError', 'message': 'not allowed, allowed values: 1|2'}],
+        ),
+        (
+            AfterParamError('invalid dates'),
+            [{'path': '', 'code': 'AfterParamError', 'message': 'invalid dates'}],
+        ),
+        (
+            InvalidRequestError(
+                get={'page': TypeConversionError()},
+                form={'name': RulesError(ValueMinLengthError(3), ValuePatternError('^[a-z]$'))},
+                path={},
+                json={'email': RequiredValueError()},
+                files=[FileMissingError('photo'), FilesLimitError(2)],
+            ),
+            [
+                {'path': '/get/page', 'code': 'TypeConversionError', 'message': 'invalid type'},
+                {'path': '/form/name', 'code': 'ValueMinLengthError', 'message': 'invalid length, min length = 3'},
+                {'path': '/form/name', 'code': 'ValuePatternError',
+                 'message': 'value does not match pattern ^[a-z]$'},
+                {'path': '/json/email', 'code': 'RequiredValueError', 'message': 'value is required'},
+                {'path': '/files/photo', 'code': 'FileMissingError', 'message': 'file is required'},
+                {'path': '/files', 'code': 'FilesLimitError', 'message': 'too many files, max files = 2'},
+            ],
+        ),
+    ])
+    def test_error_formatter(self, error, expected):
+        self.assertEqual(expected, error_formatter(error))
+
+    def test_json_errors(self):
+        _, errors = _SCHEMA.validate({
+            'name': 'a',
+            'a/b': 'd',
+            'users': [{'email': 'test@gmail.com'}, {'email': 'bad'}, 'bad_type'],
+            'tags': ['t'],
+        })
+        error = InvalidRequestError({}, {}, {}, errors, [])
+        self.assertEqual(
+            [
+                {'path': '/json/users/1/email', 'code': 'ValueEmailError', 'message': 'invalid email address'},
+                {'path': '/json/users/2', 'code': 'JsonListItemTypeError',
+                 'message': 'invalid type, expected object'},
+                {'path': '/json/tags/0', 'code': 'ValueMinLengthError', 'message': 'invalid length, min length = 2'},
+                {'path': '/json/name', 'code': 'ValueMinLengthError', 'message': 'invalid length, min length = 2'},
+                {'path': '/json/a~1b', 'code': 'ValueEnumError', 'message': 'not allowed, allowed values: c'},
+            ],
+            error_formatter(error),
+        )
+
+    def test_json_list_items(self):
+        _, errors = _SCHEMA.validate({
+            'name': 'ab',
+            'a/b': 'c',
+            'users': [],
+            'tags': [],
+            'groups': [{'address': {'city': 'x'}}, {'address': {'city': 'Oslo'}}, {'address': {'city': 'y'}}],
+        })
+        self.assertEqual(
+            [
+                {'path': '/json/groups/0/address/city', 'code': 'ValueMinLengthError',
+                 'message': 'invalid length, min length = 3'},
+                {'path': '/json/groups/2/address/city', 'code': 'ValueMinLengthError',
+                 'message': 'invalid length, min length = 3'},
+            ],
+            error_formatter(InvalidRequestError({}, {}, {}, errors, [])),
+        )
+
+    def test_demo_error_formatter(self):
+        with self.assertWarns(DeprecationWarning):
+            result = demo_error_formatter(InvalidRequestError({'page': TypeConversionError()}, {}, {}, {}, []))
+        self.assertEqual([{'message': 'invalid GET parameters', 'errors': {'page': 'invalid type'}}], result)
+
+    def test_max_errors(self):
+        error = InvalidRequestError({str(ix): RequiredValueError() for ix in range(10)}, {}, {}, {}, [])
+        result = error_formatter(error, max_errors=3)
+
+        self.assertEqual(4, len(result))
+        self.assertEqual(['/get/0', '/get/1', '/get/2'], [e['path'] for e in result[:3]])
+        self.assertEqual(
+            {'path': '', 'code': 'TooManyErrors', 'message': 'errors limit 3 exceeded'},
+            result[3],
+        )
+        self.assertEqual(10, len(error_formatter(error)))
@@ -6,6 +6,8 @@ from flask_restful import Api
 from parameterized import parameterized
 
 from flask_request_validator import *
+from flask_request_validator.files import FileStreamLimits
+from werkzeug.test import EnvironBuilder
 
 
 _app = flask.Flask(__name__)
@@ -110,7 +112,7 @@ class TestFiles(TestCase):
                 document=(io.BytesIO(b'very long document content'), 'document.pdf'),
                 photo=(io.BytesIO(b'very long photo content'), 'photo.jpg'),
             ),
-            b"[FileSizeError('document', 26, 22)]",
+            b"[FileSizeError('document.pdf', 26, 22)]",  # parsing is aborted, fields are unknown
         ),
         (
             dict(
@@ -134,6 +136,14 @@ class TestFiles(TestCase):
             ),
             b"dict_keys(['document', 'photo'])",
         ),
+        (
+            dict(document=[(io.BytesIO(b'good pdf'), 'document.pdf') for _ in range(3)]),
+            b"dict_keys(['document'])",  # max_files counts fields
+        ),
+        (
+            dict(document=[(io.BytesIO(b'good pdf'), 'document.pdf'), (io.BytesIO(b'txt'), 'notes.txt')]),
+            b"[FileMimeTypeError('notes.txt', 'text/plain', ('application/pdf', 'image/jpeg'))]",  # every file
+        ),
     ])
     def test_issue_85_chain(self, data: dict, expected: bytes):
         with _app2.test_client() as client:
@@ -145,3 +155,25 @@ class TestFiles(TestCase):
             )
 
             self.assertEqual(response.data, expected)
+
+    def test_stream_limits(self):
+        limits = FileStreamLimits([FileChain(['image/jpeg'], max_size=4, max_files=3, name_pattern='^[a-z]+$')])
+        for photo, error in (
+            ((io.BytesIO(b'very long photo'), 'photo.jpg'), FileSizeError('photo.jpg', 15, 4)),
+            ((io.BytesIO(b'doc'), 'doc.pdf'), FileMimeTypeError('doc.pdf', 'application/pdf', ('image/jpeg', ))),
+        ):
+            rest = (io.BytesIO(b'x' * 1024 * 1024), 'rest.jpg')
+            request = EnvironBuilder(method='POST', data={'photo': photo, 'rest': rest}).get_request()
+            with self.assertRaises(FileError) as e:
+                limits.parse(request)
+            self.assertEqual(repr(error), repr(e.exception))
+            self.assertEqual(0, len(request.files))
+            self.assertLess(request.environ['wsgi.input'].tell(), request.content_length)  # the rest is not read
+
+        request = EnvironBuilder(method='POST', data=dict(
+            photo=(io.BytesIO(b'pic'), 'photo.jpg'),
+            bad=(io.BytesIO(b'bad name'), 'b4d.jpg'),
+        )).get_request()
+        limits.parse(request)
+        self.assertEqual(request.files['photo'].read(), b'pic')
+        self.assertEqual(request.files['bad'].read(), b'')  # FileNameError of FileChain validation
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import flask_request_validator
+from flask_request_validator import dt_utils, exceptions, rules
+
+
+class TestLazyImport(TestCase):
+    def test_schemas_without_flask(self):
+        code = (
+            'import sys\n'
+            'from flask_request_validator import JsonParam, Param, GET, Pattern, IsEmail, File\n'
+            'JsonParam({"email": [IsEmail()], "name": [Pattern("^[a-z]+$")]}).validate({"email": "a@b.cc", "name": "a"})\n'
+            'Param("page", GET, int)\n'
+            'print(sorted(m for m in ("flask", "werkzeug", "mimetypes") if m in sys.modules))\n'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(b'[]', output.strip())
+
+    def test_exports(self):
+        for name in flask_request_validator.__all__:
+            self.assertIsNotNone(getattr(flask_request_validator, name))
+
+        public_rules = {
+            name for name, value in vars(rules).items()
+            if isinstance(value, type) and issubclass(value, rules.AbstractRule)
+            and value.__module__ == rules.__name__ and not name.startswith('_')
+        }
+        public_exceptions = {
+            name for name, value in vars(exceptions).items()
+            if isinstance(value, type) and issubclass(value, Exception)
+        }
+        self.assertFalse((public_rules | public_exceptions) - set(flask_request_validator.__all__))
+        self.assertIs(flask_request_validator.dt_from_iso, dt_utils.dt_from_iso)
+
+        with self.assertRaises(AttributeError):
+            getattr(flask_request_validator, 'undefined')
+
+    def test_submodules(self):
+        code = (
+            'import flask_request_validator as f\n'
+            'print(f.rules.MinLength.__name__, f.tables.InTable.__name__)\n'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(b'MinLength InTable', output.strip())
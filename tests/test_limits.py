@@ -0,0 +1,97 @@
+import io
+from unittest import TestCase
+
+import flask
+from parameterized import parameterized
+
+from flask_request_validator import *
+
+
+_USER = JsonParam({
+    'email': [IsEmail()],
+    'age': [IntRule()],
+    'tags': JsonParam([IntRule()], as_list=True),
+    'meta': JsonParam({'version': [IntRule()]}, required=False, extra='forbid'),
+}, extra='forbid')
+
+_app = flask.Flask(__name__)
+_app.testing = True
+
+
+@_app.errorhandler(RequestLimitError)
+def handler(e):
+    return str(e), 413
+
+
+@_app.route('/users', methods=['POST'])
+@validate_params(_USER, RequestLimits.from_schema(_USER, max_body_size=128, max_list_length=2))
+def users(valid: ValidRequest):
+    return flask.jsonify(valid.get_json())
+
+
+class TestRequestLimits(TestCase):
+    def test_from_schema(self):
+        limits = RequestLimits.from_schema(_USER, max_list_length=2)
+        self.assertEqual(2, limits.max_depth)
+        self.assertEqual(1 + 1 + 1 + (1 + 2) + (1 + 1), limits.max_nodes)
+
+        limits = RequestLimits.from_schema(JsonParam({'any': [MinLength(1)]}), max_list_length=2)
+        self.assertIsNone(limits.max_depth)
+        self.assertIsNone(limits.max_nodes)
+        self.assertIsNone(RequestLimits.from_schema(_USER).max_nodes)
+
+        limits = RequestLimits.from_schema(JsonParam({'id': [IntRule()]}), max_list_length=2)  # extra='allow'
+        self.assertEqual((None, None), (limits.max_depth, limits.max_nodes))
+        limits.check_json({'id': 1, 'meta': {'tags': [1, 2]}})
+
+    def test_from_schema_pattern(self):
+        # Pattern matches str(value), so a list is a valid value and depth can't be derived
+        schema = JsonParam({'name': [Pattern(r'^\[')]}, extra='forbid')
+        value = {'name': ['a', 'b']}
+        self.assertEqual((value, []), schema.validate(value))
+
+        limits = RequestLimits.from_schema(schema, max_list_length=2)
+        self.assertEqual((None, None), (limits.max_depth, limits.max_nodes))
+        limits.check_json(value)
+
+    @parameterized.expand([
+        ({'a': {'b': {'c': 1}}}, RequestLimits(max_depth=2), 'request exceeds max_depth = 2'),
+        ({'a': [1, 2, 3]}, RequestLimits(max_list_length=2), 'request exceeds max_list_length = 2'),
+        ({'a': 1, 'b': 2, 'c': 3}, RequestLimits(max_nodes=3), 'request exceeds max_nodes = 3'),
+        ({'a': {'b': [1, 2]}}, RequestLimits(max_depth=3, max_nodes=5, max_list_length=2), None),
+    ])
+    def test_check_json(self, value, limits: RequestLimits, expected):
+        if expected is None:
+            limits.check_json(value)
+            return
+
+        with self.assertRaises(RequestLimitError) as e:
+            limits.check_json(value)
+        self.assertEqual(expected, str(e.exception))
+
+    @parameterized.expand([
+        ({'email': 'bob@example.com', 'age': 27, 'tags': [1, 2]}, 200),
+        ({'email': 'bob@example.com', 'age': 27, 'tags': [1, 2, 3]}, 413),
+        ({'email': 'bob@example.com', 'age': 27, 'tags': [], 'meta': {'version': {'deep': 1}}}, 413),
+        ({'email': 'bob@example.com', 'age': 27, 'tags': [], 'bio': 'x' * 128}, 413),
+    ])
+    def test_limits(self, body: dict, status: int):
+        with _app.test_client() as client:
+            response = client.post('/users', json=body)
+        self.assertEqual(status, response.status_code)
+
+    def test_chunked_body(self):
+        body = b'{"email": "bob@example.com", "age": 27, "tags": [], "bio": "' + b'x' * 128 + b'"}'
+        with _app.test_client() as client:
+            response = client.post(
+                '/users',
+                input_stream=io.BytesIO(body),
+                content_type='application/json',
+                headers={'Transfer-Encoding': 'chunked'},
+                environ_overrides={'wsgi.input_terminated': True},
+            )
+        self.assertEqual((413, b'request exceeds max_body_size = 128'), (response.status_code, response.data))
+
+    def test_wrong_usage(self):
+        with self.assertRaises(WrongUsageError):
+            validate_params(RequestLimits(), RequestLimits())
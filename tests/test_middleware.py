@@ -0,0 +1,184 @@
+import io
+from unittest import TestCase, mock
+
+import flask
+from flask_restful import Api, Resource
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.middleware import ValidationMiddleware, _BufferedRequest
+
+
+class _Counter(AbstractAfterParam):
+    calls = 0
+
+    def validate(self, value: ValidRequest):
+        _Counter.calls += flask.current_app.config['COUNTER_STEP']  # after params run in the app context
+
+
+_app = flask.Flask(__name__)
+_app.testing = True
+_app.config['COUNTER_STEP'] = 1
+_app.config['LOCALE'] = 'en'
+_api = Api(_app)
+_before_request_calls = []
+
+
+@_app.before_request
+def before_request():
+    _before_request_calls.append(flask.request.path)
+
+
+@_app.route('/users/<int:user_id>', methods=['PUT'])
+@validate_params(
+    Param('user_id', PATH, int, rules=[Min(1)]),
+    Param('notify', GET, int, required=False),
+    Param('locale', GET, str, required=False, default=lambda: flask.current_app.config['LOCALE']),
+    JsonParam({'name': [MinLength(2)]}),
+    _Counter(),
+)
+def update_user(valid: ValidRequest, user_id: int):
+    return flask.jsonify(
+        path=valid.get_path_params(),
+        params=valid.get_params(),
+        json=valid.get_json(),
+        raw=flask.request.get_json(),
+        same_request=valid.get_flask_request() is flask.request,
+    )
+
+
+class _Tags(Resource):
+    @validate_params(Param('tag', FORM, str, rules=[MinLength(2)]))
+    def post(self, valid: ValidRequest):
+        return {'form': valid.get_form(), 'raw': flask.request.form['tag']}
+
+
+_api.add_resource(_Tags, '/tags')
+
+
+@_app.route('/central', methods=['POST'])
+def central():
+    return flask.jsonify(flask.request.get_json())
+
+
+@_app.route('/avatars', methods=['POST'])
+@validate_params(Param('name', FORM, str), File('avatar', ['image/png'], 2 * 1024 * 1024))
+def upload_avatar(valid: ValidRequest):
+    return flask.jsonify(name=flask.request.form['name'], size=len(flask.request.files['avatar'].read()))
+
+
+@_app.route('/events', methods=['POST'])
+@validate_params(JsonParam({'ids': [IntRule()]}), RequestLimits(max_body_size=64, max_depth=2))
+def events(valid: ValidRequest):
+    return flask.jsonify(valid.get_json())
+
+
+_app.config['MAX_CONTENT_LENGTH'] = 4 * 1024 * 1024
+_app.wsgi_app = ValidationMiddleware.from_app(_app)
+_app.wsgi_app.add('/central', [JsonParam({'id': [IntRule()]})], methods=['POST'])
+
+
+class TestValidationMiddleware(TestCase):
+    def setUp(self):
+        _before_request_calls.clear()
+        _Counter.calls = 0
+
+    @parameterized.expand([
+        ('/users/0', {'name': 'Bob'}, '/path/user_id'),
+        ('/users/1', {'name': 'B'}, '/json/name'),
+        ('/users/1?notify=yes', {'name': 'Bob'}, '/get/notify'),
+    ])
+    def test_invalid(self, url: str, body: dict, path: str):
+        with _app.test_client() as client:
+            response = client.put(url, json=body)
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(path, response.json['errors'][0]['path'])
+        self.assertEqual([], _before_request_calls)
+
+    def test_valid(self):
+        with _app.test_client() as client:
+            response = client.put('/users/7', json={'name': 'Bob'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                'path': {'user_id': 7},
+                'params': {'locale': 'en'},
+                'json': {'name': 'Bob'},
+                'raw': {'name': 'Bob'},
+                'same_request': True,
+            },
+            response.json,
+        )
+        self.assertEqual(1, _Counter.calls)  # validated once, by the middleware
+        self.assertEqual(['/users/7'], _before_request_calls)
+
+    @parameterized.expand([
+        ({'ids': 1}, 200, None),
+        ({'ids': 1, 'pad': 'x' * 100}, 413, 'request exceeds max_body_size = 64'),
+        ({'ids': 1, 'x': [[1]]}, 413, 'request exceeds max_depth = 2'),
+        ({'ids': 'one'}, 400, 'invalid type'),
+    ])
+    def test_limits(self, body: dict, status: int, message: str):
+        with _app.test_client() as client:
+            response = client.post('/events', json=body)
+        self.assertEqual(status, response.status_code)
+        if message is not None:
+            self.assertEqual(message, response.json['errors'][0]['message'])
+
+    def test_resource(self):
+        with _app.test_client() as client:
+            response = client.post('/tags', data={'tag': 'a'})
+            self.assertEqual(400, response.status_code)
+            self.assertEqual([], _before_request_calls)
+
+            response = client.post('/tags', data={'tag': 'ab'})
+            self.assertEqual({'form': {'tag': 'ab'}, 'raw': 'ab'}, response.json)
+
+    def test_central(self):
+        with _app.test_client() as client:
+            self.assertEqual(400, client.post('/central', json={'id': 'one'}).status_code)
+            self.assertEqual({'id': '1'}, client.post('/central', json={'id': '1'}).json)
+            self.assertEqual(404, client.post('/unknown', json={}).status_code)
+
+    def test_multipart(self):
+        spools = []
+        get_stream = _BufferedRequest._get_stream_for_parsing
+
+        def get_stream_for_parsing(request):
+            stream = get_stream(request)
+            spools.append(request._spool)
+            return stream
+
+        with mock.patch.object(_BufferedRequest, '_get_stream_for_parsing', get_stream_for_parsing):
+            with _app.test_client() as client:
+                for size, status in ((1024 * 1024, 200), (3 * 1024 * 1024, 400), (5 * 1024 * 1024, 413)):
+                    avatar = (io.BytesIO(b'\x00' * size), 'avatar.png', 'image/png')
+                    response = client.post('/avatars', data={'name': 'me', 'avatar': avatar})
+                    self.assertEqual(status, response.status_code)
+                    if status == 200:
+                        self.assertEqual({'name': 'me', 'size': size}, response.json)
+
+        self.assertTrue(spools[0]._rolled)  # body over spool_size is on disk, not in memory
+
+    def test_subdomains(self):
+        app = flask.Flask(__name__, subdomain_matching=True)
+        app.config['SERVER_NAME'] = 'example.com'
+
+        @app.route('/items', subdomain='api')
+        @validate_params(Param('id', GET, int))
+        def api_items(valid: ValidRequest):
+            return flask.jsonify(valid.get_params())
+
+        @app.route('/items')
+        @validate_params(Param('name', GET, str, rules=[MinLength(2)]))
+        def items(valid: ValidRequest):
+            return flask.jsonify(valid.get_params())
+
+        app.wsgi_app = ValidationMiddleware.from_app(app)
+        with app.test_client() as client:
+            self.assertEqual({'id': 1}, client.get('/items?id=1', base_url='http://api.example.com').json)
+            self.assertEqual({'name': 'ab'}, client.get('/items?name=ab', base_url='http://example.com').json)
+            response = client.get('/items?id=1', base_url='http://example.com')
+            self.assertEqual('/get/name', response.json['errors'][0]['path'])
@@ -0,0 +1,166 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import TestCase
+
+import flask
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.error_formatter import error_formatter
+from flask_request_validator.ndjson import split_chunks, validate_file, main
+
+EVENT = JsonParam({
+    'email': [IsEmail()],
+    'count': [IntRule()],
+    'tags': JsonParam([MinLength(2)], as_list=True, required=False),
+})
+
+_LINES = [
+    {'email': 'test@gmail.com', 'count': 1},
+    {'email': 'bad', 'count': 2},
+    {'email': 'test@gmail.com', 'count': '3', 'tags': ['ok', 'x']},
+    None,
+    {'email': 'test@gmail.com', 'count': 4},
+    '{"email": ',
+    {'email': 'test@gmail.com', 'count': 'five'},
+]
+
+_EXPECTED = [
+    (2, [{'path': '/email', 'code': 'ValueEmailError', 'message': 'invalid email address'}]),
+    (3, [{'path': '/tags/1', 'code': 'ValueMinLengthError', 'message': 'invalid length, min length = 2'}]),
+    (6, [{
+        'path': '',
+        'code': 'InvalidJsonError',
+        'message': 'invalid json: Expecting value: line 1 column 11 (char 10)',
+    }]),
+    (7, [{'path': '/count', 'code': 'TypeConversionError', 'message': 'invalid type'}]),
+]
+
+
+class TestNdJson(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, 'events.ndjson')
+        with open(self.path, 'w') as f:
+            for line in _LINES:
+                if line is None:
+                    f.write('\n')
+                elif isinstance(line, str):
+                    f.write(line + '\n')
+                else:
+                    f.write(json.dumps(line) + '\n')
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    @parameterized.expand([
+        (b'', 4, []),
+        (b'a\nbb\nccc\n', 1, [(0, 2), (2, 5), (5, 9)]),
+        (b'a\nbb\nccc\n', 4, [(0, 5), (5, 9)]),
+        (b'a\nbb\nccc', 100, [(0, 8)]),
+        (b'aaaaaa\nb', 2, [(0, 7), (7, 8)]),
+    ])
+    def test_split_chunks(self, data, chunk_size, expected):
+        self.assertEqual(expected, split_chunks(data, chunk_size))
+
+    @parameterized.expand([
+        (1, 1024),
+        (1, 16),
+        (2, 16),
+    ])
+    def test_validate_file(self, workers, chunk_size):
+        result = list(validate_file(self.path, 'tests.test_ndjson:EVENT', workers, chunk_size))
+        self.assertEqual(_EXPECTED, result)
+
+    def test_main(self):
+        report = os.path.join(self._dir.name, 'report.ndjson')
+        with redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(1, main([self.path, 'tests.test_ndjson:EVENT', '-w', '1', '-o', report]))
+
+        with open(report) as f:
+            self.assertEqual(
+                [{'line': line, 'errors': errors} for line, errors in _EXPECTED],
+                [json.loads(line) for line in f],
+            )
+        self.assertEqual('invalid lines: 4\n', stderr.getvalue())
+
+        valid = os.path.join(self._dir.name, 'valid.ndjson')
+        with open(valid, 'w') as f:
+            f.write(json.dumps(_LINES[0]))
+        with redirect_stdout(io.StringIO()) as stdout, redirect_stderr(io.StringIO()):
+            self.assertEqual(0, main([valid, 'tests.test_ndjson:EVENT']))
+        self.assertEqual('', stdout.getvalue())
+
+
+_app = flask.Flask(__name__)
+
+
+@_app.errorhandler(RequestError)
+def handler(e):
+    return flask.jsonify(error_formatter(e)), 400
+
+
+@_app.route('/events', methods=['POST'])
+@validate_params(NdJsonParam(EVENT, max_errors=2, max_line_size=64))
+def events(valid: ValidRequest):
+    records = valid.get_ndjson()
+    counts = [record['count'] for record in records]
+    return flask.jsonify(counts=counts, lines=records.lines, invalid=list(records.errors))
+
+
+class TestNdJsonParam(TestCase):
+    def test_ndjson_body(self):
+        body = '\n'.join([
+            json.dumps({'email': 'test@gmail.com', 'count': '1'}),
+            json.dumps({'email': 'bad', 'count': 2}),
+            '',
+            json.dumps({'email': 'test@gmail.com', 'count': 3, 'tags': ['x' * 64]}),
+            json.dumps({'email': 'test@gmail.com', 'count': 4}),
+        ])
+        with _app.test_client() as client:
+            response = client.post('/events', data=body, content_type='application/x-ndjson')
+            self.assertEqual({'counts': [1, 4], 'lines': 5, 'invalid': [2, 4]}, response.json)
+
+            response = client.post('/events', data=body + '\n{}', content_type='application/x-ndjson')
+            self.assertEqual(400, response.status_code)
+            self.assertEqual(
+                [
+                    {'path': '/json/2/email', 'code': 'ValueEmailError', 'message': 'invalid email address'},
+                    {'path': '/json/4', 'code': 'InvalidJsonError', 'message': 'invalid json: line is longer than 64 bytes'},
+                    {'path': '/json/6/email', 'code': 'MissingJsonKeyError', 'message': 'key is required'},
+                    {'path': '/json/6/count', 'code': 'MissingJsonKeyError', 'message': 'key is required'},
+                ],
+                response.json,
+            )
+
+            response = client.post('/events', data=body, content_type='application/json')
+            self.assertEqual(
+                [{
+                    'path': '/json',
+                    'code': 'InvalidJsonError',
+                    'message': 'invalid json: unsupported content type application/json, expected application/x-ndjson',
+                }],
+                response.json,
+            )
+
+    def test_request_data(self):
+        stream = io.BytesIO(b'{"email": "test@gmail.com", "count": 1}\n{"email": "test@gmail.com"}\n')
+        valid = validate_request([NdJsonParam(EVENT)], RequestData(stream=stream))
+        records = valid.get_ndjson()
+
+        self.assertEqual([{'email': 'test@gmail.com', 'count': 1}], list(records))
+        self.assertEqual([2], list(records.errors))
+
+    def test_custom_valid_request(self):
+        class CustomValidRequest(ValidRequest):
+            def get_form(self): return {}
+            def get_headers(self): return {}
+            def get_json(self): return {}
+            def get_params(self): return {}
+            def get_path_params(self): return {}
+            def get_flask_request(self): return None
+
+        self.assertIsNone(CustomValidRequest().get_ndjson())
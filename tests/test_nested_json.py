@@ -6,6 +6,7 @@ import flask
 
 from flask_request_validator import (
     JsonParam as P,
+    DiscriminatedJsonParam,
     Enum,
     CompositeRule,
     Min,
@@ -251,6 +252,171 @@ class TestJsonParam(unittest.TestCase):
 
         self.assertEqual(new_val, expected)
 
+    def test_depth_as_list(self):
+        param = P({'name': [MinLength(2)], 'tags': P([MinLength(2)], as_list=True)})
+        _, errors = param.validate({'name': 'a', 'tags': ['b']}, depth=['body', 'user'])
+        self.assertEqual(
+            "[JsonError(['body', 'user', 'tags'], {0: RulesError(ValueMinLengthError(2))}, True), "
+            "JsonError(['body', 'user'], {'name': RulesError(ValueMinLengthError(2))}, False)]",
+            str(errors),
+        )
+
+        _, errors = param.validate({'name': 'a', 'tags': 'b'})
+        self.assertEqual(
+            "[JsonListExpectedError(['root', 'tags']), "
+            "JsonError(['root'], {'name': RulesError(ValueMinLengthError(2))}, False)]",
+            str(errors),
+        )
+
+    def test_pointer(self):
+        param = P({
+            'users': P({'address': P({'city': [MinLength(3)]}), 'a/b': P([MinLength(2)], as_list=True)}, as_list=True,
+                   dedupe=8),
+        })
+        _, errors = param.validate({'users': [
+            {'address': {'city': 'x'}, 'a/b': ['xy']},
+            {'address': {'city': 'Oslo'}, 'a/b': ['x']},
+            {'address': {'city': 'x'}, 'a/b': ['xy']},
+            {'address': 'x', 'a/b': ['xy']},
+        ]})
+        self.assertEqual(
+            [
+                (['root', 'users', 'address'], '/users/0/address'),
+                (['root', 'users', 'a/b'], '/users/1/a~1b'),
+                (['root', 'users', 'address'], '/users/2/address'),
+                (['root', 'users', 'address'], '/users/3/address'),
+            ],
+            [(error.depth, error.pointer) for error in errors],
+        )
+
+    def test_scalar_list(self):
+        param = P({'ids': P([IntRule(), Min(1)], as_list=True)})
+        value, errors = param.validate({'ids': ['1', 0, {'id': 1}, 2, 'x']})
+        self.assertEqual(
+            "[JsonError(['root', 'ids'], {1: RulesError(ValueMinError(1, True)), "
+            "2: JsonListItemTypeError(False), 4: RulesError(TypeConversionError())}, True)]",
+            str(errors),
+        )
+        self.assertEqual([1, 0, {'id': 1}, 2, 'x'], value['ids'])
+
+    @parameterized.expand([
+        (P([IntRule(), Min(1)], as_list=True, dedupe=2), ['1', 1, '1', 0, True, 0, 'x', '1', {}, 1.0]),
+        (
+            P({'code': [IntRule()], 'meta': P({'src': [MinLength(1)]}, extra='strip')}, as_list=True, dedupe=1),
+            [{'code': '1', 'meta': {'src': 'web', 'x': 1}}, {'code': 1, 'meta': {'src': ''}}] * 3 + [
+                {'code': 2, 'meta': {'src': 'web'}}, {'code': 2, 'meta': {'src': 'web'}}, [],
+            ],
+        ),
+        (
+            DiscriminatedJsonParam('type', {
+                'a': P({'type': [Enum('a')], 'x': [IntRule()]}),
+                'b': P({'type': [Enum('b')]}, extra='forbid'),
+            }, as_list=True, dedupe=8),
+            [{'type': 'a', 'x': '1'}, {'type': 'b', 'x': 1}, {'type': 'a', 'x': '1'}, {'type': 'b', 'x': 1}],
+        ),
+    ])
+    def test_dedupe(self, param: P, value: list):
+        expected = deepcopy(param)
+        expected._assign('dedupe', 0)
+        expected_value, expected_errors = expected.validate(deepcopy(value))
+        new_value, errors = param.validate(deepcopy(value))
+        self.assertEqual(str(expected_errors), str(errors))
+        if not expected_errors:
+            self.assertEqual(expected_value, new_value)
+
+    def test_dedupe_copies(self):
+        param = P({'code': [IntRule()]}, as_list=True, dedupe=8)
+        value, errors = param.validate([{'code': '1'}, {'code': '1'}])
+        self.assertEqual([], errors)
+        self.assertEqual([{'code': 1}, {'code': 1}], value)
+        self.assertIsNot(value[0], value[1])
+
+    def test_discriminated(self):
+        param = P({
+            'events': DiscriminatedJsonParam('type', {
+                'click': P({'type': [Enum('click')], 'x': [IntRule()]}),
+                'view': P({'type': [Enum('view')], 'page': [MinLength(1)]}),
+            }, as_list=True),
+            'last': DiscriminatedJsonParam('type', {'click': P({'x': [IntRule()]})}, required=False),
+        })
+
+        value, errors = param.validate({
+            'events': [{'type': 'click', 'x': '1'}, {'type': 'view', 'page': '/'}],
+            'last': {'type': 'click', 'x': '2'},
+        })
+        self.assertEqual([], errors)
+        self.assertEqual(
+            {'events': [{'type': 'click', 'x': 1}, {'type': 'view', 'page': '/'}], 'last': {'type': 'click', 'x': 2}},
+            value,
+        )
+
+        _, errors = param.validate({
+            'events': [{'type': 'view', 'x': 1}, {'type': 'scroll'}, {}, 'click'],
+            'last': {'type': 'view'},
+        })
+        self.assertEqual(
+            "[JsonError(['root', 'events'], {0: {'page': RulesError(MissingJsonKeyError('page'))}, "
+            "1: {'type': RulesError(ValueEnumError(('click', 'view')))}, "
+            "2: {'type': RulesError(MissingJsonKeyError('type'))}, "
+            "3: JsonListItemTypeError()}, True), "
+            "JsonError(['root', 'last'], {'type': RulesError(ValueEnumError(('click',)))}, False)]",
+            str(errors),
+        )
+
+    def test_partial(self):
+        settings = {f'option_{ix}': [IntRule(), Min(0)] for ix in range(300)}
+        settings['theme'] = [Enum('dark', 'light')]
+        param = P(settings, partial=True)
+
+        value, errors = param.validate({'theme': 'dark', 'option_7': '7', 'unknown': 1})
+        self.assertEqual([], errors)
+        self.assertEqual({'theme': 'dark', 'option_7': 7, 'unknown': 1}, value)
+
+        _, errors = param.validate({'theme': 'red', 'option_9': -1, 'option_2': 'two'})
+        self.assertEqual(
+            "[JsonError(['root'], {'option_2': RulesError(TypeConversionError()), "
+            "'option_9': RulesError(ValueMinError(0, True)), "
+            "'theme': RulesError(ValueEnumError(('dark', 'light')))}, False)]",
+            str(errors),
+        )
+
+    def test_optional_keys_order(self):
+        param = P({
+            'a': P({'x': [IntRule()]}, required=False),
+            'b': [IntRule()],
+            'c': P({'y': [IntRule()]}),
+            'd': P({'z': [IntRule()]}, required=False),
+        })
+        _, errors = param.validate({'d': {'z': 'z'}, 'a': {'x': 'x'}, 'b': 'b'})
+        self.assertEqual(
+            "[JsonError(['root', 'a'], {'x': RulesError(TypeConversionError())}, False), "
+            "JsonError(['root', 'd'], {'z': RulesError(TypeConversionError())}, False), "
+            "JsonError(['root'], {'c': RulesError(MissingJsonKeyError('c')), "
+            "'b': RulesError(TypeConversionError())}, False)]",
+            str(errors),
+        )
+
+    def test_extra(self):
+        data = {'name': 'Bob', 'junk': {'a': [1] * 10}, 'address': {'city': 'Kyiv', 'junk': 1}}
+        param = P({'name': [MinLength(2)], 'address': P({'city': [MinLength(2)]}, extra='strip')}, extra='strip')
+        value, errors = param.validate(deepcopy(data))
+        self.assertEqual([], errors)
+        self.assertEqual({'name': 'Bob', 'address': {'city': 'Kyiv'}}, value)
+
+        param = P({'name': [MinLength(2)], 'address': P({'city': [MinLength(2)]})}, extra='forbid')
+        _, errors = param.validate(deepcopy(data))
+        self.assertEqual("[JsonError(['root'], {'junk': RulesError(UnknownJsonKeyError('junk'))}, False)]", str(errors))
+
+        _, errors = param.validate({'name': 'Bob', 'address': {'city': 'Kyiv', 'junk': 1}})
+        self.assertEqual([], errors)  # nested objects allow unknown keys by default
+
+        with self.assertRaises(WrongUsageError):
+            P({'name': [MinLength(2)]}, extra='ignore')
+
+    def test_discriminated_wrong_usage(self):
+        with self.assertRaises(WrongUsageError):
+            DiscriminatedJsonParam('type', {'click': P([IntRule()], as_list=True)})
+
 
 _app = flask.Flask(__name__)
 
@@ -0,0 +1,139 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import flask
+
+from flask_request_validator import *
+from flask_request_validator.cache import LRUCache
+from flask_request_validator.registry import SchemaRegistry
+
+
+def _user_schema() -> JsonParam:
+    return JsonParam({
+        'name': [MinLength(2), MaxLength(20)],
+        'email': [IsEmail()],
+        'tags': JsonParam([Pattern(r'^[a-z]+$')], as_list=True, required=False),
+    })
+
+
+class TestSchemaRegistry(TestCase):
+    def test_intern(self):
+        registry = SchemaRegistry()
+        first = registry.intern(_user_schema())
+        second = registry.intern(_user_schema())
+        self.assertIs(first, second)
+
+        page = registry.intern(Param('page', GET, int, required=False, default=1))
+        self.assertIs(page, registry.intern(Param('page', GET, int, required=False, default=1)))
+        self.assertIsNot(page, registry.intern(Param('page', GET, int, required=False, default=2)))
+        self.assertIsNot(page, registry.intern(Param('page', GET, str, required=False, default=1)))
+        # nested parts are shared too
+        email = registry.intern(Param('email', JSON, str, rules=[IsEmail()]))
+        self.assertIs(email.rules, registry.intern(CompositeRule(IsEmail())))
+        # lazily compiled patterns are not a part of a fingerprint
+        pattern = registry.intern(Pattern(r'^[a-z]+$'))
+        pattern.validate('test')
+        self.assertIs(pattern, registry.intern(Pattern(r'^[a-z]+$')))
+
+    def test_inputs_unchanged(self):
+        registry = SchemaRegistry()
+        registered = registry.intern(_user_schema())
+        schema = _user_schema()
+        rules_map, name_rules = schema.rules_map, schema.rules_map['name']
+        name_checks = name_rules._rules
+        self.assertIs(registered, registry.intern(schema))
+        self.assertIs(rules_map, schema.rules_map)
+        self.assertIs(name_rules, schema.rules_map['name'])
+        self.assertIs(name_checks, name_rules._rules)
+
+        param = Param('email', JSON, str, rules=[IsEmail()])
+        rules = param.rules
+        self.assertIsNot(param, registry.intern(param))  # IsEmail of the user schema is reused by a copy
+        self.assertIs(rules, param.rules)
+
+    def test_adaptive(self):
+        registry = SchemaRegistry()
+        first = Param('page', GET, int, rules=CompositeRule(Min(1), Max(9), fail_fast=True, adaptive=True))
+        second = Param('page', GET, int, rules=CompositeRule(Min(1), Max(9), fail_fast=True, adaptive=True))
+        self.assertIs(first, registry.intern(first))
+        self.assertIs(second, registry.intern(second))
+        self.assertEqual(0, len(registry))
+        with self.assertRaises(WrongUsageError):
+            registry.add('page', first)
+
+    def test_identity_objects(self):
+        registry = SchemaRegistry()
+        first = registry.intern(Param('page', GET, int, required=False, default=lambda: 1))
+        second = registry.intern(Param('page', GET, int, required=False, default=lambda: 1))
+        self.assertIsNot(first, second)
+
+    def test_save_load(self):
+        registry = SchemaRegistry()
+        schema = registry.intern(_user_schema())
+        registry.intern(Param('page', GET, int, required=False, default=lambda: 1))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'schemas.pickle')
+            registry.save(path)
+            loaded = SchemaRegistry.load(path)
+
+        self.assertEqual(len(registry) - 1, len(loaded))
+        self.assertIn(_user_schema(), loaded)
+        loaded_schema = loaded.intern(_user_schema())
+        self.assertIsNot(schema, loaded_schema)
+
+        _, errors = loaded_schema.validate({'name': 'a', 'email': 'test@gmail.com', 'tags': ['ok', 'NO']})
+        self.assertEqual(
+            "[JsonError(['root', 'tags'], {1: RulesError(ValuePatternError('^[a-z]+$'))}, True), "
+            "JsonError(['root'], {'name': RulesError(ValueMinLengthError(2))}, False)]",
+            str(errors),
+        )
+
+    def test_validate_params(self):
+        registry = SchemaRegistry()
+        app = flask.Flask(__name__)
+
+        @app.route('/first', methods=['POST'])
+        @registry.validate_params(Param('page', GET, int, required=False, default=1), _user_schema())
+        def first(valid: ValidRequest):
+            return flask.jsonify([valid.get_params(), valid.get_json()])
+
+        registered = len(registry)
+
+        @app.route('/second', methods=['POST'])
+        @registry.validate_params(Param('page', GET, int, required=False, default=1), _user_schema())
+        def second(valid: ValidRequest):
+            return flask.jsonify([valid.get_params(), valid.get_json()])
+
+        self.assertEqual(registered, len(registry))
+        with app.test_client() as client:
+            for route in ('/first', '/second'):
+                response = client.post(route + '?page=3', json={'name': 'ab', 'email': 'test@gmail.com'})
+                self.assertEqual([{'page': 3}, {'name': 'ab', 'email': 'test@gmail.com'}], response.json)
+
+    def test_names(self):
+        registry = SchemaRegistry()
+        schema = registry.add('users.body', _user_schema())
+        self.assertIs(schema, registry.intern(_user_schema()))
+        registry.add('users.page', Param('page', GET, int, required=False, default=lambda: 1))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'schemas.pickle')
+            registry.save(path)
+            loaded = SchemaRegistry.load(path)
+
+        self.assertIsInstance(loaded.get('users.body'), JsonParam)
+        with self.assertRaises(WrongUsageError):
+            loaded.get('users.page')  # identity objects are not saved
+
+        app = flask.Flask(__name__)
+
+        @app.route('/users', methods=['POST'])
+        @loaded.validate_params('users.body', typed=True, cache=LRUCache())
+        def users(valid: ValidRequest):
+            return flask.jsonify(name=valid.json.name)
+
+        with app.test_client() as client:
+            response = client.post('/users', json={'name': 'ab', 'email': 'test@gmail.com'})
+            self.assertEqual({'name': 'ab'}, response.json)
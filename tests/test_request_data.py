@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+from parameterized import parameterized
+from werkzeug.datastructures import MultiDict, Headers
+
+from flask_request_validator import *
+
+
+_PARAMS = (
+    Param('Authorization', HEADER, str, rules=[Enum('Bearer token')]),
+    Param('key', PATH, str, rules=[Enum('key1', 'key2')]),
+    Param('page', GET, int),
+    Param('tags', GET, list, required=False),
+    Param('flag', FORM, bool, required=False, default=False),
+    JsonParam({'name': [MinLength(2)], 'age': [IntRule()]}),
+)
+
+
+class TestRequestData(TestCase):
+    @parameterized.expand([
+        (
+            RequestData(
+                args={'page': '2', 'tags': ['a,b', 'c']},
+                form={'flag': 'true'},
+                view_args={'key': 'key1'},
+                headers={'authorization': 'Bearer token'},
+                json={'name': 'Bob', 'age': '27'},
+            ),
+        ),
+        (
+            RequestData(
+                args=MultiDict([('page', '2'), ('tags', 'a,b'), ('tags', 'c')]),
+                form=MultiDict([('flag', 'true')]),
+                view_args={'key': 'key1'},
+                headers=Headers({'Authorization': 'Bearer token'}),
+                json={'name': 'Bob', 'age': '27'},
+            ),
+        ),
+    ])
+    def test_valid(self, source: RequestData):
+        valid = validate_request(_PARAMS, source)
+
+        self.assertEqual({'page': 2, 'tags': ['a', 'b', 'c']}, valid.get_params())
+        self.assertEqual({'flag': True}, valid.get_form())
+        self.assertEqual({'key': 'key1'}, valid.get_path_params())
+        self.assertEqual({'Authorization': 'Bearer token'}, valid.get_headers())
+        self.assertEqual({'name': 'Bob', 'age': 27}, valid.get_json())
+        self.assertIs(source, valid.get_flask_request())
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidHeadersError) as e:
+            validate_request(_PARAMS, RequestData())
+        self.assertEqual(['Authorization'], list(e.exception.errors))
+
+        with self.assertRaises(InvalidRequestError) as e:
+            validate_request(_PARAMS, RequestData(
+                args={'page': 'first'},
+                view_args={'key': 'key3'},
+                headers={'Authorization': 'Bearer token'},
+                json={'name': 'B'},
+            ))
+
+        self.assertEqual(['page'], list(e.exception.get))
+        self.assertEqual(['key'], list(e.exception.path))
+        self.assertEqual({}, e.exception.json)  # body is not read when url is invalid
+
+        with self.assertRaises(InvalidRequestError) as e:
+            validate_request(_PARAMS, RequestData(
+                args={'page': '1'},
+                view_args={'key': 'key1'},
+                headers={'Authorization': 'Bearer token'},
+                json={'name': 'B'},
+            ))
+
+        self.assertEqual({}, e.exception.get)
+        self.assertEqual(
+            "[JsonError(['root'], {'name': RulesError(ValueMinLengthError(2)), "
+            "'age': RulesError(MissingJsonKeyError('age'))}, False)]",
+            str(e.exception.json),
+        )
+
+    def test_max_length(self):
+        params = (Param('page', GET, int, max_length=4), Param('tags', GET, list, multi=True, max_length=4))
+        with self.assertRaises(InvalidRequestError) as e:
+            validate_request(params, RequestData(args={'page': '1' * 5000, 'tags': ['a', 'b' * 5]}))
+
+        self.assertEqual(
+            "{'page': RulesError(ValueMaxLengthError(4)), 'tags': RulesError(ValueMaxLengthError(4))}",
+            str(e.exception.get),
+        )
+
+    def test_plan(self):
+        plan = validation_plan([Param('page', GET, int), JsonParam({'name': [MinLength(2)]})], typed=True)
+        first = validate_request(plan, RequestData(args={'page': '1'}, json={'name': 'Bob'}))
+        second = validate_request(plan, RequestData(args={'page': '2'}, json={'name': 'Ann'}), typed=True)
+
+        self.assertEqual((1, 'Bob', 2, 'Ann'), (first.args.page, first.json.name, second.args.page, second.json.name))
+        self.assertIs(type(first.json), type(second.json))
+        with self.assertRaises(InvalidRequestError):
+            validate_request(plan, RequestData(args={'page': '3'}, json={'name': 'A'}))
+        with self.assertRaises(WrongUsageError):
+            validate_request(validation_plan([Param('page', GET, int)]), RequestData(), typed=True)
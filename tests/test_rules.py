@@ -5,7 +5,9 @@ from datetime import timezone, timedelta
 from parameterized import parameterized
 
 from flask_request_validator.rules import *
+from flask_request_validator.rules import _AdaptiveOrder, _re2
 from flask_request_validator.exceptions import *
+from flask_request_validator.nested_json import JsonParam
 
 
 class TestRules(unittest.TestCase):
@@ -39,6 +41,95 @@ class TestRules(unittest.TestCase):
             self.assertTrue(1, len(e.errors))
             self.assertTrue(isinstance(e.errors[0], expected))
 
+    @parameterized.expand([
+        ([IntRule(), Min(1), Max(10), Enum(1, 5, 10)], ['5', 5, 0, 11, '11', 7, 'x', None, 5.0, True]),
+        ([MinLength(2), MaxLength(4), Pattern(r'^[a-z]+$')], ['ab', 'abcd', 'a', 'abcde', 'AB', 12, None, [1, 2]]),
+        ([Min(0, False), Max(1, False), Min(-1)], [0, 0.5, 1, -0.5, float('nan'), '1']),
+        ([Enum('a', 'bb'), MaxLength(2), IsEmail()], ['a', 'bb', 'c', '', 'a@b.c']),
+        ([Enum([1], [2]), MinLength(1)], [[1], [3], 1]),
+        ([Enum(1, 2), Pattern(r'^\d$')], [1, 2, 3, True, 1.0]),
+    ])
+    def test_composite_fast_path(self, rules, values):
+        fused, original = CompositeRule(*rules), CompositeRule(*rules)
+        original._get_fast_path = lambda: None
+        for value in values:
+            try:
+                expected = original.validate(value)
+            except Exception as e:
+                with self.assertRaises(type(e)) as fused_error:
+                    fused.validate(value)
+                self.assertEqual(repr(e), repr(fused_error.exception))
+                continue
+            self.assertEqual(repr(expected), repr(fused.validate(value)))
+
+    def test_composite_fast_path_plan(self):
+        self.assertIsNone(CompositeRule(NotEmpty(), MinLength(1))._get_fast_path())
+
+        fast_path = CompositeRule(Enum('ab', 'cd'), MinLength(2), MaxLength(2), Pattern('^[a-z]+$'))._get_fast_path()
+        self.assertEqual(1, len(fast_path._predicates))  # rules passed by every Enum value are dropped
+        self.assertEqual([], fast_path._validators)
+
+    def test_composite_fail_fast(self):
+        rules = CompositeRule(MinLength(5), Pattern(r'^\d+$'), fail_fast=True)
+        with self.assertRaises(RulesError) as e:
+            rules.validate('abc')
+        self.assertEqual('RulesError(ValueMinLengthError(5))', repr(e.exception))
+        self.assertIsNone(rules._fast_path)
+
+        for adaptive in (False, True):
+            rules = CompositeRule(IntRule(), Min(1), fail_fast=True, adaptive=adaptive)
+            with self.assertRaises(RulesError) as e:
+                rules.validate('x')
+            self.assertEqual('RulesError(TypeConversionError())', repr(e.exception))
+
+        _, errors = JsonParam({'id': CompositeRule(IntRule(), Min(1), fail_fast=True)}).validate({'id': 'x'})
+        self.assertEqual("[JsonError(['root'], {'id': RulesError(TypeConversionError())}, False)]", str(errors))
+
+        with self.assertRaises(WrongUsageError):
+            CompositeRule(MinLength(5), adaptive=True)
+
+    def test_composite_adaptive(self):
+        rules = CompositeRule(Pattern(r'^[a-z]+$'), MinLength(1), MaxLength(3), fail_fast=True, adaptive=True)
+        for _ in range(_AdaptiveOrder.SAMPLE_RATE * _AdaptiveOrder.REORDER_EVERY):
+            self.assertRaises(RulesError, rules.validate, 'abcdef')
+        self.assertEqual([[2, 0, 1]], rules._adaptive_order._segments)  # frequently failing check first
+
+        with self.assertRaises(RulesError) as e:
+            rules.validate('ABCDEF')
+        self.assertEqual("RulesError(ValuePatternError('^[a-z]+$'))", repr(e.exception))  # first in declared order
+        self.assertEqual('abc', rules.validate('abc'))
+
+        for value in (None, 5):  # Pattern guards the type of MaxLength in declared order
+            with self.assertRaises(RulesError) as e:
+                rules.validate(value)
+            self.assertEqual("RulesError(ValuePatternError('^[a-z]+$'))", repr(e.exception))
+
+    @parameterized.expand([
+        (Pattern(r'^[a-z]+$', max_length=3), ['ab', 'abcd', 'AB', 12, None]),
+        (Enum('a', 1, [2]), ['a', 1, True, 'b', [2], [3]]),
+        (MinLength(2), ['ab', 'a', '', [1, 2]]),
+        (MaxLength(2), ['ab', 'abc', (1, 2, 3)]),
+        (NotEmpty(), [' a ', '  ', '']),
+        (IsEmail(), ['a@b.c', 'a@b', '']),
+        (IntRule(max_length=2), [1, '7', '700', 'x', 1.5, None, True]),
+        (IntRule(False), [1, '7']),
+        (BoolRule({'yes', 1}, {'no', 0}), [True, 'YES', 'No', 1, 0, 2, 'x', 1.0, None]),
+        (Datetime('%Y-%m-%d'), ['2021-01-01', '2021-13-01', '']),
+        (CompositeRule(IntRule(), Min(1), Max(10), Enum(1, 5, 10)), ['5', 0, 11, 'x', 7, None]),
+        (CompositeRule(MinLength(5), Pattern(r'^\d+$'), fail_fast=True), ['12345', 'abc', '123456a']),
+        (CompositeRule(NotEmpty(), MaxLength(2)), [' ab ', ' ', 'abc']),
+    ])
+    def test_validate_batch(self, rule: AbstractRule, values: list):
+        results, errors = rule.validate_batch(values)
+        self.assertEqual(len(values), len(results))
+        for ix, value in enumerate(values):
+            try:
+                self.assertEqual(rule.validate(value), results[ix])
+                self.assertNotIn(ix, errors)
+            except (TypeConversionError, RuleError, RulesError) as e:
+                self.assertEqual(repr(e), repr(errors[ix]))
+                self.assertEqual(value, results[ix])
+
     def test_composite_wrong_usage(self):
         checkers = [
             Number(),
@@ -56,6 +147,35 @@ class TestRules(unittest.TestCase):
         with self.assertRaises(expected_exception=WrongUsageError):
             CompositeRule(*checkers[0:2])
 
+    @parameterized.expand([
+        (IntRule(max_length=3), '999', 999),
+        (IntRule(max_length=3), '1' * 5000, TypeConversionError),
+        (FloatRule({'.'}, max_length=4), '9.99', 9.99),
+        (FloatRule({'.'}, max_length=4), '9.999', TypeConversionError),
+    ])
+    def test_conversion_max_length(self, rule, value, expected):
+        if type(expected) is type:
+            self.assertRaises(expected, rule.validate, value)
+            return
+        self.assertEqual(expected, rule.validate(value))
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(WrongUsageError) as e:
+            Pattern('(')
+        self.assertIn("'('", str(e.exception))
+
+    def test_linear_pattern(self):
+        if _re2() is None:
+            with self.assertRaises(WrongUsageError):
+                Pattern(r'^[a-z]+$', linear=True)
+            return
+
+        rule = Pattern(r'^\d*\d*\d*\d*x$', max_length=1000, linear=True)
+        self.assertIsNotNone(rule._compiled)
+        self.assertRaises(ValuePatternError, rule.validate, '1' * 400)
+        with self.assertRaises(WrongUsageError):
+            Pattern(r'^(a)\1$', linear=True)
+
     @parameterized.expand([
         # Pattern
         (
@@ -66,6 +186,15 @@ class TestRules(unittest.TestCase):
                 [' ', ValuePatternError],
             ]
         ),
+        (
+            Pattern(r'^[a-z]+(-[a-z]{1,8})?$', max_length=10),
+            [
+                ['mogwai', 'mogwai'],
+                ['sigur-ros', 'sigur-ros'],
+                ['explosions-in-the-sky', ValueMaxLengthError],
+                ['a' * 64 + '!', ValueMaxLengthError],
+            ]
+        ),
         # Enum
         (
             Enum('thievery corporation', 'bonobo'),
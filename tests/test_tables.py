@@ -0,0 +1,63 @@
+import json
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.tables import build_table, main
+
+
+class TestInTable(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, 'values.table')
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    @parameterized.expand([(10, ), (0, )])
+    def test_lookup(self, bloom_bits: int):
+        values = [f'sku-{i}' for i in range(1000)] + ['', 'ü', 42]
+        self.assertEqual(1003, build_table(values + ['sku-1'], self.path, bloom_bits))
+
+        for rule in (InTable(self.path), InTable(self.path, bloom=False)):
+            for value in values:
+                self.assertEqual(value, rule.validate(value))
+            for value in ('sku-1000', 'sku', 'u', 43, None):
+                self.assertNotIn(value, rule)
+                self.assertRaises(ValueTableError, rule.validate, value)
+
+        rule = CompositeRule(InTable(self.path, deny=True))
+        self.assertEqual('sku', rule.validate('sku'))
+        with self.assertRaises(RulesError) as e:
+            rule.validate('sku-7')
+        self.assertEqual('value is denied', str(e.exception))
+
+    def test_surrogates(self):
+        build_table(['a', '\ud800'], self.path)
+        param = JsonParam({'d': [InTable(self.path)]})
+        self.assertEqual(({'d': '\ud800'}, []), param.validate(json.loads('{"d": "\\ud800"}')))
+        self.assertNotIn('\udfff', InTable(self.path))
+        _, errors = param.validate(json.loads('{"d": "\\udfff"}'))
+        self.assertIsInstance(errors[0].errors['d'].errors[0], ValueTableError)
+
+    def test_pickle(self):
+        build_table(['a'], self.path)
+        rule = InTable(self.path)
+        rule.validate('a')
+        self.assertIn('a', pickle.loads(pickle.dumps(rule)))
+
+    def test_main(self):
+        source = os.path.join(self._dir.name, 'values.txt')
+        with open(source, 'w') as f:
+            f.write('a.com\n\nb.com\r\na.com\n')
+        self.assertEqual(0, main([source, self.path, '--bloom-bits', '4']))
+        self.assertEqual(['a.com', 'b.com'], [v for v in ('a.com', 'b.com', 'c.com', '') if v in InTable(self.path)])
+
+    def test_wrong_usage(self):
+        open(self.path, 'wb').close()
+        with self.assertRaises(WrongUsageError):
+            InTable(self.path).validate('a')
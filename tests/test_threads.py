@@ -0,0 +1,79 @@
+import sys
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from flask_request_validator import *
+
+_PARAMS = (
+    Param('page', GET, int, rules=[Min(1), Max(100)]),
+    Param('X-Tenant', HEADER, str, rules=CompositeRule(
+        Pattern(r'^[a-z]+$'), MaxLength(8), fail_fast=True, adaptive=True,
+    )),
+    JsonParam({
+        'email': [IsEmail()],
+        'kind': [Enum('a', 'b')],
+        'tags': JsonParam([Pattern(r'^\w+$'), MaxLength(4)], as_list=True, dedupe=4),
+    }),
+)
+
+
+def _request(ix: int) -> RequestData:
+    return RequestData(
+        args={'page': str(ix % 120)},
+        headers={'X-Tenant': 'abc' if ix % 7 else 'ABC'},
+        json={
+            'email': f'user{ix}@example.com' if ix % 5 else 'user',
+            'kind': 'ab'[ix % 2] if ix % 11 else 'c',
+            'tags': ['a', 'b', f't{ix % 3}', 'a'] if ix % 13 else ['a', '-'],
+        },
+    )
+
+
+def _outcome(plan: Any, ix: int) -> tuple:
+    try:
+        valid = validate_request(plan, _request(ix))
+    except RequestError as e:
+        return type(e).__name__, str(e)
+    return valid.get_params(), valid.get_headers(), valid.get_json()
+
+
+class TestThreads(TestCase):
+    def test_shared_plan(self):
+        expected = [_outcome(validation_plan(_PARAMS), ix) for ix in range(2000)]
+        plan = validation_plan(_PARAMS)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                outcomes = list(pool.map(lambda ix: _outcome(plan, ix), range(2000)))
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(expected, outcomes)
+
+    def test_immutable(self):
+        rules_map = {'name': [MinLength(1)]}
+        param = JsonParam(rules_map)
+        self.assertEqual({'name': [MinLength]}, {k: [type(r) for r in v] for k, v in rules_map.items()})
+        self.assertIsInstance(param.rules_map['name'], CompositeRule)
+
+        for obj, attribute in (
+            (param, 'required'),
+            (Param('page', GET, int), 'rules'),
+            (NdJsonParam(param), 'max_errors'),
+            (RequestLimits(max_depth=2), 'max_depth'),
+        ):
+            with self.assertRaises(AttributeError):
+                setattr(obj, attribute, None)
+        with self.assertRaises(TypeError):
+            param.rules_map['age'] = CompositeRule(IntRule())
+
+        schema = DiscriminatedJsonParam('type', {'a': JsonParam({'type': [Enum('a')]})})
+        with self.assertRaises(TypeError):
+            schema.schemas['b'] = param
+
+        mime_types = ['image/png']
+        file = File('avatar', mime_types, 1024)
+        mime_types.append('image/gif')
+        self.assertEqual(('image/png', ), file._mime_types)
+        self.assertIsInstance(CompositeRule(MinLength(1))._rules, tuple)
@@ -0,0 +1,81 @@
+from unittest import TestCase, mock
+
+from parameterized import parameterized
+
+from flask_request_validator import *
+from flask_request_validator.typed import TypedValues, _JsonType
+
+
+_PARAMS = (
+    Param('X-Request-Id', HEADER, str),
+    Param('page', GET, int),
+    Param('class', GET, str, required=False),
+    Param('flag', FORM, bool, required=False, default=False),
+    JsonParam({
+        'name': [MinLength(2)],
+        'address': JsonParam({'city': [MinLength(2)]}),
+        'events': DiscriminatedJsonParam('type', {
+            'click': JsonParam({'type': [Enum('click')], 'x': [IntRule()]}),
+        }, as_list=True),
+    }),
+)
+
+
+class TestTyped(TestCase):
+    def test_typed(self):
+        valid = validate_request(_PARAMS, RequestData(
+            args={'page': '2'},
+            headers={'X-Request-Id': 'a1'},
+            json={'name': 'Bob', 'address': {'city': 'Kyiv'}, 'events': [{'type': 'click', 'x': '1'}], 'junk': 1},
+        ), typed=True)
+
+        self.assertEqual(2, valid.args.page)
+        self.assertIsNone(valid.args.class_)
+        self.assertFalse(valid.form.flag)
+        self.assertEqual('a1', valid.headers.X_Request_Id)
+        self.assertEqual('Kyiv', valid.json.address.city)
+        self.assertEqual(1, valid.json.events[0].x)
+        self.assertIsInstance(valid.json, TypedValues)
+        self.assertFalse(hasattr(valid.json, '__dict__'))
+        self.assertFalse(hasattr(valid.json, 'junk'))
+
+        self.assertEqual({'page': 2}, valid.get_params())
+        self.assertEqual({'X-Request-Id': 'a1'}, valid.get_headers())
+        self.assertEqual('Bob', valid.get_json()['name'])
+
+    @parameterized.expand([(0, ), (8, )])
+    def test_single_walk(self, dedupe: int):
+        params = (JsonParam({
+            'users': JsonParam({'name': [MinLength(2)], 'tags': JsonParam([MinLength(1)], as_list=True)},
+                               as_list=True, dedupe=dedupe, extra='strip'),
+        }), )
+        users = [{'name': 'Bob', 'tags': ['a'], 'junk': 1}, {'name': 'Ann', 'tags': []}]
+        # objects are built while validating. only copies of dedupe items are converted
+        with mock.patch.object(_JsonType, 'convert', side_effect=lambda value: value) as convert:
+            valid = validate_request(params, RequestData(json={'users': users + users[:1]}), typed=True)
+        self.assertEqual(1 if dedupe else 0, convert.call_count)
+
+        self.assertEqual(['Bob', 'Ann', 'Bob'], [user.name for user in valid.json.users])
+        self.assertEqual([['a'], [], ['a']], [user.tags for user in valid.json.users])
+        self.assertIsNot(valid.json.users[0], valid.json.users[2])
+        self.assertEqual({'name': 'Bob', 'tags': ['a']}, valid.get_json()['users'][2])
+
+    def test_dicts_cached(self):
+        valid = validate_request(_PARAMS[:2], RequestData(args={'page': '2'}, headers={'X-Request-Id': 'a1'}), typed=True)
+        self.assertIs(valid.get_params(), valid.get_params())
+        valid.set_value(GET, 'page', 3)
+        self.assertEqual({'page': 3}, valid.get_params())
+
+    def test_json_params(self):
+        valid = validate_request(
+            (Param('name', JSON, str), Param('age', JSON, int, required=False)),
+            RequestData(json={'name': 'Bob'}),
+            typed=True,
+        )
+        self.assertEqual('Bob', valid.json.name)
+        self.assertIsNone(valid.json.age)
+        self.assertEqual({'name': 'Bob'}, valid.get_json())
+
+    def test_wrong_usage(self):
+        with self.assertRaises(WrongUsageError):
+            validate_params(Param('a-b', GET, str), Param('a_b', GET, str), typed=True)
@@ -309,10 +309,35 @@ class TestParam(TestCase):
         (Param('test', FORM, bool), False, '0'),
         (Param('test', FORM, bool), False, 'false'),
         (Param('test', FORM, bool), False, 'False'),
+        # repeated GET keys
+        (Param('test', GET, list), ['Minsk', 'Prague', 'Berlin'], ['Minsk, Prague', 'Berlin']),
+        (Param('test', GET, list, multi=True), ['Minsk, Prague', 'Berlin'], ['Minsk, Prague', 'Berlin']),
+        (
+            Param('test', GET, dict),
+            {'country': 'Belarus', 'capital': 'Minsk'},
+            ['country: Belarus', 'capital: Minsk'],
+        ),
+        (
+            Param('test', GET, dict, multi=True),
+            {'cities': 'Minsk,Brest', 'capital': 'Minsk'},
+            ['cities: Minsk,Brest', 'capital: Minsk'],
+        ),
+        # JSON values are not split
+        (Param('test', JSON, list), ['a,b', 1], ['a,b', 1]),
+        (Param('test', JSON, dict), {'a': 1}, {'a': 1}),
     ])
     def test_value_to_type(self, param, expected, value):
         self.assertEqual(param.value_to_type(value), expected)
 
+    @parameterized.expand([
+        (PATH, list),
+        (JSON, list),
+        (GET, str),
+        (FORM, int),
+    ])
+    def test_multi_wrong_usage(self, param_type, value_type):
+        self.assertRaises(WrongUsageError, Param, 'test', param_type, value_type, multi=True)
+
 
 @_app.route('/test_default', methods=['POST'])
 @validate_params(
@@ -328,6 +353,42 @@ def default_value(valid):
     return flask.jsonify(params)
 
 
+@_app.route('/multi', methods=['POST'])
+@validate_params(
+    Param('tags', GET, list, rules=[MaxLength(3)]),
+    Param('filters', GET, list, multi=True),
+    Param('sort', GET, dict, required=False, multi=True),
+    Param('names', FORM, list, required=False, multi=True),
+)
+def multi_value(valid: ValidRequest):
+    return flask.jsonify([valid.get_params(), valid.get_form()])
+
+
+class TestMultiValue(TestCase):
+    def test_multi_value(self):
+        with _app.test_client() as client:
+            query = urlencode(
+                dict(tags=['a, b', 'c'], filters=['price<10,000', 'color=red'], sort=['price:desc', 'name:asc']),
+                doseq=True,
+            )
+            response = client.post('/multi?' + query, data=dict(names=['Lennon, John', 'Starr, Ringo']))
+            self.assertEqual(
+                [
+                    {
+                        'tags': ['a', 'b', 'c'],
+                        'filters': ['price<10,000', 'color=red'],
+                        'sort': {'price': 'desc', 'name': 'asc'},
+                    },
+                    {'names': ['Lennon, John', 'Starr, Ringo']},
+                ],
+                response.json,
+            )
+
+            with self.assertRaises(InvalidRequestError) as e:
+                client.post('/multi?' + urlencode(dict(tags=['a,b,c', 'd']), doseq=True))
+            self.assertEqual(['filters', 'tags'], sorted(e.exception.get))
+
+
 class TestDefault(TestCase):
     def test_default_value(self):
         with _app.test_client() as client: